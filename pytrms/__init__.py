@@ -31,7 +31,7 @@ def connect(host=None, method='webapi'):
         return IoniClient(host)
 
     if method.lower() == 'modbus':
-        from .modbus import IoniconModbus
+        from .clients.modbus import IoniconModbus
         return IoniconModbus(host)
 
     raise NotImplementedError(str(method))
@@ -27,6 +27,9 @@ def _on_connect(client, self, flags, rc):
     log.debug(f"[{self}] " + "\n   --> ".join(["subscribing to"] + list(map(str, subs))))
     rv = client.subscribe(subs)
     log.info(f"[{self}] successfully connected with {rv = }")
+    # wake up the thread waiting for the connection:
+    with self._state_update:
+        self._state_update.notify_all()
 
 def _on_subscribe(client, self, mid, granted_qos):
     log.info(f"[{self}] successfully subscribed with {mid = } | {granted_qos = }")
@@ -52,6 +55,9 @@ class MqttClientBase(IoniClientBase):
             connect_timeout_s=10):
         assert len(subscriber_functions) > 0, "no subscribers: for some unknown reason this causes disconnects"
         super().__init__(host, port)
+        # Note: the callbacks notify this condition on every change of the connection
+        #  (or of the server-state), so that we can wait for it rather than polling:
+        self._state_update = Condition()
 
         # Note: Version 2.0 of paho-mqtt introduced versioning of the user-callback to fix
         #  some inconsistency in callback arguments and to provide better support for MQTTv5.
@@ -96,13 +102,10 @@ class MqttClientBase(IoniClientBase):
         log.info(f"[{self}] connecting to MQTT broker...")
         self.client.connect(self.host, self.port, timeout_s)
         self.client.loop_start()  # runs in a background thread
-        started_at = time.monotonic()
-        while time.monotonic() < started_at + timeout_s:
-            if self.is_connected:
-                break
-
-            time.sleep(10e-3)
-        else:
+        with self._state_update:
+            is_connected = self._state_update.wait_for(lambda: self.is_connected, timeout_s)
+        # (disconnect outside the lock, since this waits for the callback-thread)
+        if not is_connected:
             self.disconnect()
             raise TimeoutError(f"[{self}] no connection to IoniTOF")
 
@@ -106,9 +106,10 @@ class IoniConnect(IoniClientBase):
         from pytrms.peaktable import Peak, PeakTable
         from operator import attrgetter
 
-        # Note: a `Peak` is a hashable object that serves as a key that
-        #  distinguishes between peaks as defined by PyTRMS:
-        make_key = lambda peak: Peak(center=peak['center'], label=peak['name'], shift=peak['shift'])
+        # Note: a peak is distinguished by its (rounded) center and label, the same
+        #  way a `Peak` is hashed, but a plain tuple is much cheaper to create
+        #  and both sides are matched in a single pass over the dict-keys:
+        make_key = lambda peak: (round(float(peak['center']), Peak._exact_decimals), str(peak['name']))
 
         if isinstance(peaktable, str):
             log.info(f"loading peaktable '{peaktable}'...")
@@ -32,6 +32,9 @@ class IoniClient:
     ('localhost', 8002)
     
     '''
+    # the `.get()`-methods return the raw JSON response:
+    returns_json = True
+
     def __init__(self, host='localhost', port=8002):
         self.host = host
         self.port = port
@@ -4,11 +4,13 @@
 import os
 import struct
 import time
+import zlib
 import logging
 from collections import namedtuple
 from functools import lru_cache
 from itertools import tee
 
+import numpy as np
 import pyModbusTCP.client
 
 from . import _par_id_file
@@ -36,12 +38,28 @@ def _patch_is_open():
 
 _is_open = _patch_is_open()
 
-with open(_par_id_file) as f:
-    it = iter(f)
-    assert next(it).startswith('ID\tName'), ("Modbus parameter file is corrupt: "
-            + f.name
-            + "\n\ntry re-installing the PyTRMS python package to fix it!")
-    _id_to_descr = {int(id_): name for id_, name, *_ in (line.strip().split('\t') for line in it)}
+@lru_cache
+def _id_to_descr():
+    """Returns the parameter names as a list indexed by par-ID."""
+    # Note: the par-IDs are (almost) contiguous, so a list is the fastest
+    #  lookup-table and empty strings fill in the gaps:
+    with open(_par_id_file) as f:
+        it = iter(f)
+        assert next(it).startswith('ID\tName'), ("Modbus parameter file is corrupt: "
+                + f.name
+                + "\n\ntry re-installing the PyTRMS python package to fix it!")
+        pairs = [(int(id_), name) for id_, name, *_ in (line.strip().split('\t') for line in it)]
+
+    lut = [''] * (max(id_ for id_, _ in pairs) + 1)
+    for id_, name in pairs:
+        lut[id_] = name
+
+    return lut
+
+@lru_cache
+def _descr_to_id():
+    """Returns the par-IDs as a dict keyed by parameter name."""
+    return {descr: id_ for id_, descr in enumerate(_id_to_descr()) if descr}
 
 # look-up-table for c_structs (see docstring of struct-module for more info).
 # Note: almost *all* parameters used by IoniTOF (esp. AME) are 'float', with
@@ -56,10 +74,15 @@ _fmts = dict([
 ])
 
 _register = namedtuple('register_info', ['n_registers', 'c_format', 'reg_format'])
+_codec = namedtuple('codec_info', ['n_registers', 'value_struct', 'reg_struct'])
 _timecycle = namedtuple('timecycle_info', ('rel_cycle', 'abs_cycle', 'abs_time', 'rel_time'))
 _parameter = namedtuple('parameter_info', ('set', 'act', 'par_id', 'state'))
 
+# the key for a mass in the address-space and the traces (bound once for speed):
+_mass_key = "{0:.4}".format
 
+
+@lru_cache
 def _get_fmt(c_format):
     if c_format in _fmts:
         c_format = _fmts[c_format]
@@ -70,6 +93,15 @@ def _get_fmt(c_format):
     return _register(n_registers, c_format, reg_format)
 
 
+@lru_cache
+def _get_codec(c_format):
+    # Note: pre-compiled structs skip parsing the format-string on every call,
+    #  which adds up when decoding hundreds of registers in one go:
+    n_registers, c_format, reg_format = _get_fmt(c_format)
+
+    return _codec(n_registers, struct.Struct(c_format), struct.Struct(reg_format))
+
+
 def _unpack(registers, format='>f'):
     """Convert a list of register values to a numeric Python value.
 
@@ -90,10 +122,10 @@ def _unpack(registers, format='>f'):
     4750153048903029768
     
     """
-    n, c_format, reg_format = _get_fmt(format)
-    assert n == len(registers), f"c_format '{c_format}' needs [{n}] registers (got [{len(registers)}])"
+    n, value_struct, reg_struct = _get_codec(format)
+    assert n == len(registers), f"c_format '{value_struct.format}' needs [{n}] registers (got [{len(registers)}])"
 
-    return struct.unpack(c_format, struct.pack(reg_format, *registers))[0]
+    return value_struct.unpack(reg_struct.pack(*registers))[0]
 
 def _pack(value, format='>f'):
     """Convert floating point 'value' to registers.
@@ -102,9 +134,9 @@ def _pack(value, format='>f'):
     8-bit registers, for 2-byte (single) and 4-byte (double)
     representation, respectively.
     """
-    _, c_format, reg_format = _get_fmt(format)
+    _, value_struct, reg_struct = _get_codec(format)
 
-    return struct.unpack(reg_format, struct.pack(c_format, value))
+    return reg_struct.unpack(value_struct.pack(value))
 
 
 class IoniconModbus(IoniClientBase):
@@ -158,11 +190,15 @@ class IoniconModbus(IoniClientBase):
         initial_count = self._alive_counter
         timeout_s = 3  # counter should increase every 500 ms, approximately
         started_at = time.monotonic()
+        # Note: every poll is a round-trip to the server, so we back off
+        #  exponentially rather than asking a hundred times a second:
+        delay_s = 10e-3
         while time.monotonic() < started_at + timeout_s:
             if initial_count != self._alive_counter:
                 return True
 
-            time.sleep(10e-3)
+            time.sleep(delay_s)
+            delay_s = min(2 * delay_s, 200e-3)
         return False
 
     @property
@@ -242,10 +278,31 @@ class IoniconModbus(IoniClientBase):
     def n_parameters(self):
         return int(self._read_reg(*self.address['n_parameters']))
 
+    # re-read the number of masses from the server after this many seconds:
+    n_masses_ttl_s = 5.0
+
+    # Note: there seems to be a limitation of modbus that
+    #  the limits the number of registers to 125, so we
+    #  read input-registers in blocks of (at most) this size:
+    max_registers_per_request = 120
+
+    _n_masses = None
+    _n_masses_read_at = 0.0
+
     @property
-    @lru_cache
     def n_masses(self):
-        return int(self._read_reg(*self.address['n_masses']))
+        # Note: the number of masses changes only with a new peak-table, so
+        #  we don't want to spend a round-trip on every call to `.read_traces()`:
+        if (self._n_masses is None
+                or time.monotonic() > self._n_masses_read_at + self.n_masses_ttl_s):
+            n_masses = int(self._read_reg(*self.address['n_masses']))
+            if self._n_masses is not None and n_masses != self._n_masses:
+                # the mass-table has changed and needs to be reloaded:
+                self.read_masses.cache_clear()
+            self._n_masses = n_masses
+            self._n_masses_read_at = time.monotonic()
+
+        return self._n_masses
 
     @property
     @lru_cache
@@ -263,6 +320,9 @@ class IoniconModbus(IoniClientBase):
         except KeyError as exc:
             raise KeyError("did you call one of .read_instrument_data(), .read_traces(), et.c. first?")
 
+    # the decoded parameters of every superblock, keyed by its offset and CRC:
+    _superblocks = None
+
     def read_instrument_data(self):
 
         # Each block consists of 6 registers:
@@ -272,35 +332,66 @@ class IoniconModbus(IoniClientBase):
         # Register 6: Parameter state
         start_register = 2001
         blocksize = 6
-        superblocksize = 20*blocksize
+        # (as many whole blocks as fit into one request)
+        superblocksize = (self.max_registers_per_request // blocksize) * blocksize
 
+        if self._superblocks is None:
+            self._superblocks = dict()
+
+        id_to_descr = _id_to_descr()
         rv = dict()
-        # read 20 parameters at once to save transmission..
+        # read 20 parameters (or so) at once to save transmission..
         for superblock in range(0, blocksize*self.n_parameters, superblocksize):
             offset = start_register + superblock
             # always using input_register
             input_regs = self.mc.read_input_registers(offset, superblocksize)
-            # ..and handle one block per parameter:
-            for block in range(0, superblocksize, blocksize):
-                par_id, set1, set2, act1, act2, state = input_regs[block:block+6]
-                par_id = _unpack([par_id], '>H')
-                if len(rv) >= self.n_parameters or par_id == 0:
+            if input_regs is None:
+                raise IOError(f"unable to read ({superblocksize}) registers at [{offset}] from connection")
+
+            # Note: most parameters change rarely, so if the checksum of the raw
+            #  registers is unchanged, we re-use what we decoded the last time:
+            input_regs = np.array(input_regs, dtype='>u2')
+            crc = zlib.crc32(input_regs.tobytes())
+            cached = self._superblocks.get(offset)
+            if cached is None or cached[0] != crc:
+                decoded = list(self._decode_superblock(input_regs, offset, blocksize, id_to_descr))
+                cached = self._superblocks[offset] = (crc, decoded)
+
+            for descr, address, parameter in cached[1]:
+                if len(rv) >= self.n_parameters:
                     break
 
-                try:
-                    descr = _id_to_descr[par_id]
-                except KeyError as exc:
-                    log.error("par Id %d not in par_ID_list!" % (par_id))
-                    continue
-
                 # save the *act-value* in the address-space for faster lookup:
-                self.address[descr] = (start_register + superblock + block + 1 + 2, '>f')
-                vset = _unpack([set1, set2], '>f')
-                vact = _unpack([act1, act2], '>f')
-                rv[descr] = _parameter(vset, vact, par_id, state)
+                self.address[descr] = address
+                rv[descr] = parameter
 
         return rv
 
+    @staticmethod
+    def _decode_superblock(input_regs, offset, blocksize, id_to_descr):
+        # ..decode the whole superblock at once by re-interpreting the
+        #  registers 2-5 of every block as two big-endian floats..
+        blocks = input_regs.reshape(-1, blocksize)
+        values = np.ascontiguousarray(blocks[:, 1:5]).view('>f4')
+        decoded = zip(
+            values[:, 0].tolist(),  # set
+            values[:, 1].tolist(),  # act
+            blocks[:, 0].tolist(),  # par_id
+            blocks[:, 5].tolist(),  # state
+        )
+        # ..and handle one block per parameter:
+        for block, parameter in enumerate(map(_parameter._make, decoded)):
+            par_id = parameter.par_id
+            if par_id == 0:
+                break
+
+            descr = id_to_descr[par_id] if par_id < len(id_to_descr) else ''
+            if not descr:
+                log.error("par Id %d not in par_ID_list!" % (par_id))
+                continue
+
+            yield descr, (offset + block * blocksize + 1 + 2, '>f'), parameter
+
     def write_instrument_data(self, par_id, new_value, timeout_s=10):
 
         # Each command-block consists of 3 registers:
@@ -309,24 +400,28 @@ class IoniconModbus(IoniClientBase):
         start_register = 40000
         blocksize = 3
 
+        id_to_descr = _id_to_descr()
         if isinstance(par_id, str):
             try:
-                par_id = next(k for k, v in _id_to_descr.items() if v == par_id)
-            except StopIteration as exc:
+                par_id = _descr_to_id()[par_id]
+            except KeyError as exc:
                 raise KeyError(str(par_id))
         par_id = int(par_id)
-        if par_id not in _id_to_descr:
+        if not (0 <= par_id < len(id_to_descr) and id_to_descr[par_id]):
             raise IndexError(str(par_id))
 
         start_register += blocksize * par_id
 
-        retry_time = 0
-        while retry_time < timeout_s:
+        started_at = time.monotonic()
+        # Note: the register is usually ready again after a few milliseconds, so
+        #  we back off exponentially rather than sleeping half a second at once:
+        delay_s = 10e-3
+        while time.monotonic() < started_at + timeout_s:
             # a value of 0 indicates ready-to-write:
             if self.mc.read_holding_registers(start_register) == [0]:
                 break
-            retry_time += 0.5
-            time.sleep(0.5)
+            time.sleep(delay_s)
+            delay_s = min(2 * delay_s, 500e-3)
         else:
             raise TimeoutError(f'register {start_register} timed out after {timeout_s}s')
 
@@ -341,7 +436,7 @@ class IoniconModbus(IoniClientBase):
         if update_address_at:
             n_bytes, c_fmt, _ = _get_fmt(with_format)
             self.address.update({
-                "{0:.4}".format(mass): (update_address_at + i * n_bytes, c_fmt)
+                _mass_key(mass): (update_address_at + i * n_bytes, c_fmt)
                 for i, mass in enumerate(masses)
             })
 
@@ -359,7 +454,7 @@ class IoniconModbus(IoniClientBase):
         values = self._read_reg_multi(start_reg, c_fmt, self.n_masses, _is_holding)
 
         return dict(zip(
-            ("{0:.4}".format(mass) for mass in masses), values
+            map(_mass_key, masses), values
         ))
 
     def read_timecycle(self, kind='conc'):
@@ -369,13 +464,13 @@ class IoniconModbus(IoniClientBase):
         Relative time as double (8 bytes) in seconds since measurement start.
         """
         start_reg, _, _is_holding = self.address['tc_' + kind]
+        # Note: the four values are contiguous (2 floats, 2 doubles), so we
+        #  read all 12 registers at once and decode them from one buffer:
+        register = self._read_registers(start_reg + 2, 12, _is_holding)
+        buf = struct.pack('>12H', *register)
+        rel_cycle, abs_cycle, abs_time, rel_time = struct.unpack_from('>ffdd', buf)
 
-        return _timecycle(
-            int(  self._read_reg(start_reg +  2, '>f', _is_holding)),
-            int(  self._read_reg(start_reg +  4, '>f', _is_holding)),
-            float(self._read_reg(start_reg +  6, '>d', _is_holding)),
-            float(self._read_reg(start_reg + 10, '>d', _is_holding)),
-        )
+        return _timecycle(int(rel_cycle), int(abs_cycle), abs_time, rel_time)
 
     @lru_cache
     def read_component_names(self):
@@ -385,13 +480,14 @@ class IoniconModbus(IoniClientBase):
         data_start_reg, c_fmt, _       = self.address['tc_components']
         data_start_reg += 14  # skip timecycle info..
 
-        _read = self.mc.read_holding_registers if _is_holding else self.mc.read_input_registers
+        # read all names at once and convert the registers to bytes in one go..
+        n_chars = 32
+        register = self._read_registers_batched(name_start_reg, self.n_components * n_chars // 2, _is_holding)
+        chars = np.array(register, dtype='>u2').tobytes()
         rv = []
         for index in range(self.n_components):
-            n_bytes, c_format, reg_format = _get_fmt('>16H')
-            register = _read(name_start_reg + index * 16, n_bytes)
-            chars = struct.pack(reg_format, *register)
-            decoded = chars.decode('latin-1').strip('\x00')
+            # ..and cut out one name after the other:
+            decoded = chars[index * n_chars:(index + 1) * n_chars].decode('latin-1').strip('\x00')
             self.address[decoded] = (data_start_reg + index * 2, c_fmt, _is_holding)
             rv.append(decoded)
 
@@ -429,13 +525,21 @@ class IoniconModbus(IoniClientBase):
     ])
 
     def read_ame_numbers(self):
-        return IoniconModbus._ame_parameter(
-            int(self._read_reg(*self.address['step_number'])),
-            int(self._read_reg(*self.address['run_number'])),
-            int(self._read_reg(*self.address['use_mean'])),
-            int(self._read_reg(*self.address['action_number'])),
-            int(self._read_reg(*self.address['user_number'])),
-        )
+        # Note: the AME numbers lie close together in the address-space, so
+        #  rather than requesting them one by one, we read the whole range once:
+        addresses = [self.address[name] for name in IoniconModbus._ame_parameter._fields]
+        start_reg = min(addr for addr, _, _ in addresses)
+        stop_reg = max(addr + _get_fmt(c_fmt).n_registers for addr, c_fmt, _ in addresses)
+        _is_holding = addresses[0][2]
+        register = self._read_registers(start_reg, stop_reg - start_reg, _is_holding)
+
+        values = []
+        for addr, c_fmt, _ in addresses:
+            offset = addr - start_reg
+            n_regs = _get_fmt(c_fmt).n_registers
+            values.append(int(_unpack(register[offset:offset+n_regs], c_fmt)))
+
+        return IoniconModbus._ame_parameter._make(values)
 
     _ame_mean = namedtuple('ame_mean_info', [
         'data_ok',
@@ -453,12 +557,17 @@ class IoniconModbus(IoniClientBase):
 
     def read_ame_mean(self, step_number=None):
         start_reg, c_fmt, _is_holding = self.address['ame_mean_data']
-        data_ok = int(self._read_reg(start_reg, c_fmt, _is_holding))
+        mod_reg, mod_fmt, _ = self.address['n_ame_mean']
+        # Note: the header (data_ok, mod_time, n_masses, n_steps) is contiguous
+        #  in the address-space, so we read it with a single request:
+        header = self._read_registers(start_reg, 10, _is_holding)
+        data_ok = int(_unpack(header[0:2], c_fmt))
         if not data_ok:
             return IoniconModbus._ame_mean(data_ok, 0, 0, 0, [], [])
 
-        n_masses = int(self._read_reg(start_reg + 6, c_fmt, _is_holding))
-        n_steps  = int(self._read_reg(start_reg + 8, c_fmt, _is_holding))
+        mod_time = _unpack(header[mod_reg - start_reg:mod_reg - start_reg + 4], mod_fmt)
+        n_masses = int(_unpack(header[6:8], c_fmt))
+        n_steps  = int(_unpack(header[8:10], c_fmt))
 
         if step_number is None:
             step_number = int(self._read_reg(*self.address['step_number']))
@@ -471,58 +580,55 @@ class IoniconModbus(IoniClientBase):
                 + n_masses * 2  # skip the masses, same as everywhere
                 + (step_number-1) * datablock_size * 2)  # select datablock
 
+        # ..and the same goes for the datablock of the selected step:
+        start_cycle, stop_cycle, *values = self._read_reg_multi(start_addr, c_fmt, datablock_size, _is_holding)
+
         return IoniconModbus._ame_mean(
             data_ok,
-            self._read_reg(*self.address['n_ame_mean']),
-            self._read_reg(start_addr + 0, c_fmt, _is_holding),
-            self._read_reg(start_addr + 2, c_fmt, _is_holding),
-            self._read_reg_multi(start_addr + 4,                c_fmt, n_masses, _is_holding),
-            self._read_reg_multi(start_addr + 4 + n_masses * 2, c_fmt, n_masses, _is_holding),
+            mod_time,
+            start_cycle,
+            stop_cycle,
+            values[:n_masses],
+            values[n_masses:],
         )
 
-    def _read_reg(self, addr, c_format, is_holding_register=False):
-        n_bytes, c_format, reg_format = _get_fmt(c_format)
+    def _read_registers(self, addr, n_regs, is_holding_register=False):
         _read = self.mc.read_holding_registers if is_holding_register else self.mc.read_input_registers
-        
-        register = _read(addr, n_bytes)
+
+        register = _read(addr, n_regs)
         if register is None and _is_open(self.mc):
-            raise IOError(f"unable to read ({n_bytes}) registers at [{addr}] from connection")
+            raise IOError(f"unable to read ({n_regs}) registers at [{addr}] from connection")
         elif register is None and not _is_open(self.mc):
             raise IOError("trying to read from closed Modbus-connection")
 
-        return _unpack(register, c_format)
+        return register
 
-    def _read_reg_multi(self, addr, c_format, n_values, is_holding_register=False):
-        rv = []
-        if not n_values > 0:
-            return rv
+    def _read_registers_batched(self, addr, n_regs, is_holding_register=False):
+        batch = self.max_registers_per_request
+        registers = []
+        for block in range(0, n_regs, batch):
+            registers += self._read_registers(addr + block, min(batch, n_regs - block), is_holding_register)
 
-        _read = self.mc.read_holding_registers if is_holding_register else self.mc.read_input_registers
+        return registers
 
-        n_bytes, c_format, reg_format = _get_fmt(c_format)
-        n_regs = n_bytes * n_values
+    def _read_reg(self, addr, c_format, is_holding_register=False):
+        # Note: the codec is looked up once and decodes the registers in place, since
+        #  the response always carries exactly the number of registers we asked for:
+        n_regs, value_struct, reg_struct = _get_codec(c_format)
+        register = self._read_registers(addr, n_regs, is_holding_register)
 
-        # Note: there seems to be a limitation of modbus that
-        #  the limits the number of registers to 125, so we
-        #  read input-registers in blocks of 120:
-        blocks = ((addr + block, min(120, n_regs - block))
-                    for block in range(0, n_regs, 120))
+        return value_struct.unpack(reg_struct.pack(*register))[0]
 
-        for block in blocks:
-            register = _read(*block)
-            if register is None and self.is_connected:
-                raise IOError(f"unable to read ({block[1]}) registers at [{block[0]}] from connection")
-            elif register is None and not self.is_connected:
-                raise IOError("trying to read from closed Modbus-connection")
+    def _read_reg_multi(self, addr, c_format, n_values, is_holding_register=False):
+        if not n_values > 0:
+            return []
 
-            # group the register-values by n_bytes, e.g. [1,2,3,4,..] ~> [(1,2),(3,4),..]
-            # this is a trick from the itertools-recipes, see
-            # https://docs.python.org/3.8/library/itertools.html?highlight=itertools#itertools-recipes
-            # note, that the iterator is cloned n-times and therefore 
-            # all clones advance in parallel and can be zipped below:
-            batches = [iter(register)] * n_bytes
+        n_bytes, c_format, reg_format = _get_fmt(c_format)
+        n_regs = n_bytes * n_values
 
-            rv += [_unpack(reg, c_format) for reg in zip(*batches)]
+        registers = self._read_registers_batched(addr, n_regs, is_holding_register)
 
-        return rv
+        # re-interpret the big-endian registers as values of the
+        #  requested type, e.g. [(1,2),(3,4),..] ~> [f1, f2,..], at once:
+        return np.array(registers, dtype='>u2').view(c_format).tolist()
 
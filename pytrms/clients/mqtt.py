@@ -1,16 +1,21 @@
 import os
+import re
 import time
 import json
 import queue
+import struct
 from collections import deque, namedtuple
 from datetime import datetime
 from functools import wraps
 from itertools import cycle, chain, zip_longest
 from threading import Condition, RLock
 
+import numpy as np
+
 from . import _logging
 from . import _par_id_file
 from .._base import itype, MqttClientBase
+from ..helpers import loads_json
 
 
 log = _logging.getLogger(__name__)
@@ -97,6 +102,22 @@ class ParsingError(Exception):
     pass
 
 
+# Note: the (big-endian) dtypes of the fullcycle-data are set up only once,
+#  not for every cycle that is parsed:
+_f32 = np.dtype(np.float32).newbyteorder('>')
+_f64 = np.dtype(np.float64).newbyteorder('>')
+_i16 = np.dtype(np.int16).newbyteorder('>')
+_i32 = np.dtype(np.int32).newbyteorder('>')
+_i64 = np.dtype(np.int64).newbyteorder('>')
+_chr = np.dtype(np.int8).newbyteorder('>')
+
+# (single values are unpacked with `struct`, which is much cheaper than an array)
+_scalar = {
+    _i16: struct.Struct('>h'),
+    _i32: struct.Struct('>i'),
+}
+
+
 def _parse_data_element(elm):
     '''
     raises: ParsingError, KeyError
@@ -136,22 +157,14 @@ def _parse_fullcycle(byte_string, need_add_data=False):
     
     @returns a namedtuple ('timecycle', 'intensity', 'mass_cal', 'add_data')
     '''
-    import numpy as np
-
-    _f32 = np.dtype(np.float32).newbyteorder('>')
-    _f64 = np.dtype(np.float64).newbyteorder('>')
-    _i16 = np.dtype(np.int16).newbyteorder('>')
-    _i32 = np.dtype(np.int32).newbyteorder('>')
-    _i64 = np.dtype(np.int64).newbyteorder('>')
-    _chr = np.dtype(np.int8).newbyteorder('>')
-
     offset = 0
 
     def rd_single(dtype=_i32):
         nonlocal offset
-        _arr = np.frombuffer(byte_string, dtype=dtype, count=1, offset=offset)
-        offset += _arr.nbytes
-        return _arr[0]
+        _fmt = _scalar[dtype]
+        value, = _fmt.unpack_from(byte_string, offset)
+        offset += _fmt.size
+        return value
     
     def rd_arr1d(dtype=_f32, count=None):
         nonlocal offset
@@ -171,7 +184,11 @@ def _parse_fullcycle(byte_string, need_add_data=False):
 
     def rd_string():
         nonlocal offset
-        return rd_arr1d(dtype=_chr).tobytes().decode('latin-1').lstrip('\x00')
+        count = rd_single()
+        # Note: slicing the bytes saves the detour through a numpy-array:
+        rv = byte_string[offset:offset+count].decode('latin-1').lstrip('\x00')
+        offset += count
+        return rv
     
     tc_cluster      = rd_arr1d(dtype=_f64, count=4)
     run__, cpx__    = rd_arr1d(dtype=_f64, count=2)  # (discarded)
@@ -200,17 +217,16 @@ def _parse_fullcycle(byte_string, need_add_data=False):
     n_add_data      = rd_single()
     for i in range(n_add_data):
         grp_name    = rd_string()
-        descr = []
-        for i in range(rd_single()):
-            descr.append(rd_string())
-        units = []
-        for i in range(rd_single()):
-            units.append(rd_string())
+        descr       = [rd_string() for _ in range(rd_single())]
+        units       = [rd_string() for _ in range(rd_single())]
         data        = rd_arr1d(dtype=_f32)
         view        = rd_arr1d(dtype=_chr)
         n_lv_times  = rd_single()
         offset += 16 * n_lv_times  # skipping LabVIEW timestamp
-        add_data[grp_name] = [itype.add_data_item_t(*tup) for tup in zip_longest(data, descr, units, view)]
+        # Note: converting the (big-endian) arrays with `.tolist()` at once is much
+        #  cheaper than unboxing one numpy-scalar after the other:
+        add_data[grp_name] = [itype.add_data_item_t(*tup)
+            for tup in zip_longest(data.tolist(), descr, units, view.tolist())]
 
     # MassCal #
     mc_masses       = rd_arr1d(dtype=_f64)
@@ -234,7 +250,7 @@ class CalcConzInfo:
     @staticmethod
     def load_json(json_string):
         cc = CalcConzInfo()
-        j = json.loads(json_string)
+        j = loads_json(json_string)
         delm = j["DataElement"]
         for li in delm["Value"]["PISets"]["PiSets"]:
             if not li["PriIonSetName"]:
@@ -272,40 +288,53 @@ def follow_calc_conz_info(client, self, msg):
 
     log.debug(f"updating tm-/pi-table from {msg.topic}...")
     self._calcconzinfo.append(CalcConzInfo.load_json(msg.payload.decode('latin-1')))
+    with self._state_update:
+        self._state_update.notify_all()
 
 follow_calc_conz_info.topics = ["PTR/Act/PTR_CalcConzInfo"]
 
-def follow_schedule(client, self, msg):
-    with follow_schedule._lock:
-        if msg.topic.endswith("SRV_ScheduleClear"):
+def _update_schedule(self, msg, payload):
+    if msg.topic.endswith("SRV_ScheduleClear"):
+        self._sched_cmds.clear()
+        return
+
+    if msg.topic.endswith("SRV_Schedule"):
+        if not msg.payload:
+            log.warn("empty ACQ_SRV_Schedule payload has cleared retained topic")
             self._sched_cmds.clear()
             return
 
-        if msg.topic.endswith("SRV_Schedule"):
-            if not msg.payload:
-                log.warn("empty ACQ_SRV_Schedule payload has cleared retained topic")
-                self._sched_cmds.clear()
-                return
+        if msg.retain:
+            # Note: we either have received a message that has been
+            #  retained because of a new connection..
+            self._sched_cmds.clear()
+            self._sched_cmds.extend(payload["CMDs"])
+        else:
+            #  ..or the schedule as maintained by IoniTOF has changed,
+            #  which we handle ourselves below:
+            pass
 
-            if msg.retain:
-                # Note: we either have received a message that has been
-                #  retained because of a new connection..
-                payload = json.loads(msg.payload.decode())
-                self._sched_cmds.clear()
-                self._sched_cmds.extend(payload["CMDs"])
-            else:
-                #  ..or the schedule as maintained by IoniTOF has changed,
-                #  which we handle ourselves below:
-                pass
+    if msg.topic.startswith("IC_Command"):
+        if not msg.payload:
+            log.error("empty IC_Command! has topic been cleared?")
+            return
 
-        if msg.topic.startswith("IC_Command"):
-            if not msg.payload:
-                log.error("empty IC_Command! has topic been cleared?")
-                return
+        # these are the freshly added scheduling requests:
+        self._sched_cmds.extend(payload["CMDs"])
 
-            # these are the freshly added scheduling requests:
-            payload = json.loads(msg.payload.decode())
-            self._sched_cmds.extend(payload["CMDs"])
+def follow_schedule(client, self, msg):
+    # Note: the payload is decoded before taking the lock, which is then
+    #  held only for updating the schedule:
+    payload = None
+    if msg.payload and (msg.retain or msg.topic.startswith("IC_Command")):
+        if not msg.topic.endswith("SRV_ScheduleClear"):
+            payload = loads_json(msg.payload)
+
+    with follow_schedule._lock:
+        _update_schedule(self, msg, payload)
+    # the schedule is part of the connection-check, so wake up the waiting thread(s):
+    with self._state_update:
+        self._state_update.notify_all()
 
 follow_schedule.topics = [
     "DataCollection/Act/ACQ_SRV_Schedule",
@@ -320,7 +349,7 @@ def follow_state(client, self, msg):
         self._server_state = MqttClient._server_state
         return
 
-    payload = json.loads(msg.payload.decode())
+    payload = loads_json(msg.payload)
     state = payload["DataElement"]["Value"]
     log.debug(f"[{self}] new server-state: " + str(state))
     # replace the current state with the new element:
@@ -333,6 +362,9 @@ def follow_state(client, self, msg):
     if just_started:
         # invalidate the source-file until we get a new one:
         self._sf_filename.append(_NOT_INIT)
+    # wake up the thread(s) waiting for a change of state:
+    with self._state_update:
+        self._state_update.notify_all()
 
 follow_state.topics = ["DataCollection/Act/ACQ_SRV_CurrentState"]
 
@@ -340,13 +372,15 @@ def follow_sourcefile(client, self, msg):
     if not msg.payload:
         # empty payload will clear a retained topic
         self._sf_filename = MqttClient._sf_filename
-        return
-
-    payload = json.loads(msg.payload.decode())
-    path = payload["DataElement"]["Value"]
-    log.debug(f"[{self}] new source-file: " + str(path))
-    # replace the current path with the new element:
-    self._sf_filename.append(path)
+    else:
+        payload = loads_json(msg.payload)
+        path = payload["DataElement"]["Value"]
+        log.debug(f"[{self}] new source-file: " + str(path))
+        # replace the current path with the new element:
+        self._sf_filename.append(path)
+    # wake up the thread(s) waiting for the source-file:
+    with self._state_update:
+        self._state_update.notify_all()
 
 follow_sourcefile.topics = ["DataCollection/Act/ACQ_SRV_SetFullStorageFile"]
 
@@ -373,7 +407,7 @@ def follow_act_set_values(client, self, msg):
             log.warning(f"unknown par-ID in [{msg.topic}]")
             return
 
-        payload = json.loads(msg.payload.decode())
+        payload = loads_json(msg.payload)
         if kind == "Act":
             self.act_values[parID] = _parse_data_element(payload["DataElement"])
         if kind == "Set":
@@ -390,15 +424,29 @@ def follow_act_set_values(client, self, msg):
 
 follow_act_set_values.topics = ["+/Act/+", "+/Set/+"]
 
+# Note: the cycle is published with every new cycle, but we need only a single number
+#  of its payload, which we pick without parsing the whole document:
+_cycle_value = re.compile(rb'"DataElement"\s*:\s*\{[^{}]*"Value"\s*:\s*"?(-?\d+)')
+
 def follow_cycle(client, self, msg):
     if not msg.payload:
         # empty payload will clear a retained topic
         return
 
-    payload = json.loads(msg.payload.decode())
-    current = int(payload["DataElement"]["Value"])
+    match = _cycle_value.search(msg.payload)
+    if match is not None:
+        current = int(match.group(1))
+    else:
+        payload = loads_json(msg.payload)
+        current = int(payload["DataElement"]["Value"])
+    if current == self._overallcycle[0]:
+        # nothing has changed, so nobody needs to wake up:
+        return
+
     # replace the current timecycle with the new element:
     self._overallcycle.append(current)
+    with self._state_update:
+        self._state_update.notify_all()
 
 follow_cycle.topics = ["DataCollection/Act/ACQ_SRV_OverallCycle"]
 
@@ -485,14 +533,11 @@ class MqttClient(MqttClientBase):
         # Note: '_NOT_INIT' is set by us on start of acquisition, so we'd expect
         #  to receive the source-file-topic after a (generous) timeout:
         timeout_s = 15
-        started_at = time.monotonic()
-        while time.monotonic() < started_at + timeout_s:
-            if self._sf_filename[0] is not _NOT_INIT:
+        with self._state_update:
+            if self._state_update.wait_for(lambda: self._sf_filename[0] is not _NOT_INIT, timeout_s):
                 return self._sf_filename[0]
-    
-            time.sleep(10e-3)
-        else:
-            raise TimeoutError(f"[{self}] unable to retrieve source-file after ({timeout_s = })");
+
+        raise TimeoutError(f"[{self}] unable to retrieve source-file after ({timeout_s = })");
 
     @property
     def current_cycle(self):
@@ -552,16 +597,13 @@ class MqttClient(MqttClientBase):
 
     def get_table(self, table_name):
         timeout_s = 10
-        started_at = time.monotonic()
         try:
-            while time.monotonic() < started_at + timeout_s:
+            with self._state_update:
                 # confirm change of state:
-                if not self._calcconzinfo[0] is _NOT_INIT:
+                if self._state_update.wait_for(lambda: not self._calcconzinfo[0] is _NOT_INIT, timeout_s):
                     return self._calcconzinfo[0].tables[table_name]
-    
-                time.sleep(10e-3)
-            else:
-                raise TimeoutError(f"[{self}] unable to retrieve calc-conz-info from PTR server");
+
+            raise TimeoutError(f"[{self}] unable to retrieve calc-conz-info from PTR server");
         except KeyError as exc:
             raise KeyError(str(exc) + f", possible values: {list(CalcConzInfo.tables.keys())}")
 
@@ -674,13 +716,9 @@ class MqttClient(MqttClientBase):
         else:
             self.write('ACQ_SRV_Start_Meas_Record', path.replace('/', '\\'))
         timeout_s = 30
-        started_at = time.monotonic()
-        while time.monotonic() < started_at + timeout_s:
-            if self.is_running:
-                break
-
-            time.sleep(10e-3)
-        else:
+        with self._state_update:
+            is_started = self._state_update.wait_for(lambda: self.is_running, timeout_s)
+        if not is_started:
             self.disconnect()
             raise TimeoutError(f"[{self}] error starting measurement");
 
@@ -697,14 +735,10 @@ class MqttClient(MqttClientBase):
             self.block_until(future_cycle)
         # ..for this timeout to be applicable:
         timeout_s = 30
-        started_at = time.monotonic()
-        while time.monotonic() < started_at + timeout_s:
+        with self._state_update:
             # confirm change of state:
-            if not self.is_running:
-                break
-
-            time.sleep(10e-3)
-        else:
+            is_stopped = self._state_update.wait_for(lambda: not self.is_running, timeout_s)
+        if not is_stopped:
             self.disconnect()
             raise TimeoutError(f"[{self}] error stopping measurement");
 
@@ -713,11 +747,18 @@ class MqttClient(MqttClientBase):
 
         Returns the actual current cycle.
         '''
-        while self.is_running:
-            if self._overallcycle[0] >= int(cycle):
-                break
-            time.sleep(10e-3)
-        else:
+        cycle = int(cycle)
+
+        def has_passed():
+            return not self.is_running or self._overallcycle[0] >= cycle
+
+        with self._state_update:
+            # Note: a lost connection will not be notified, so we
+            #  wake up every once in a while to check for it:
+            while not self._state_update.wait_for(has_passed, timeout=1.0):
+                pass
+
+        if not self.is_running:
             return 0
 
         return self._overallcycle[0]
@@ -761,7 +802,22 @@ class MqttClient(MqttClientBase):
             #  if block is true and timeout is None, [the q.get()] operation goes into an
             #  uninterruptible wait on an underlying lock. This means that no exceptions
             #  can occur, and in particular a SIGINT will not trigger a KeyboardInterrupt!
-            yield q.get(block=True, timeout=timeout_s)  # waiting for measurement to run...
+            #  Therefore, we wait in slices, which also lets us notice a lost connection:
+            deadline = float('inf') if timeout_s is None else time.monotonic() + timeout_s
+            while True:
+                try:
+                    # waiting for measurement to run...
+                    first = q.get(block=True, timeout=max(0, min(1.0, deadline - time.monotonic())))
+                    break
+                except queue.Empty:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"no measurement running after {timeout_s} seconds")
+
+                    if not self.is_connected:
+                        # no data will come, so better prevent a deadlock:
+                        return
+
+            yield first
 
             while self.is_running or not q.empty():
                 if q.full():
@@ -777,10 +833,6 @@ class MqttClient(MqttClientBase):
                 except queue.Empty:
                     continue
 
-        except queue.Empty:
-            assert timeout_s is not None, "this should never happen"
-            raise TimeoutError("no measurement running after {timeout_s} seconds")
-
         finally:
             #  ...also, when using more than one iterator, the first to finish will
             #  unsubscribe and cause all others to stop maybe before the time!
@@ -7,6 +7,8 @@ from collections import namedtuple
 from itertools import tee
 from functools import wraps
 
+from ..helpers import dumps_json
+
 __all__ = ['Step', 'Composition']
 
 log = logging.getLogger(__name__)
@@ -150,7 +152,7 @@ class Composition(Iterable):
         return self.max_runs > 0
 
     def dump(self, ofstream):
-        json.dump(self, ofstream, indent=2, default=vars)
+        ofstream.write(dumps_json(self, default=vars))
 
     def translate_op_modes(self, preset_items, check=True):
         '''Given the `preset_items` (from a presets-file), compile a list of set_values.
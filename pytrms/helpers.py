@@ -2,21 +2,104 @@
 
 common helper functions.
 """
+import re
+
 
 def convert_labview_to_posix(lv_time_utc, utc_offset_sec):
-    '''Create a `pandas.Timestamp` from LabView time.'''
-    from pandas import Timestamp
+    '''Create a `pandas.Timestamp` from LabView time.
+
+    If `lv_time_utc` is a numpy-array, a `pandas.DatetimeIndex` is returned.
+    '''
+    from pandas import Timestamp, to_datetime
     
     # change epoch from 01.01.1904 to 01.01.1970:
     posix_time = lv_time_utc - 2082844800
     # the tz must be specified in isoformat like '+02:30'..
     tz_sec = int(utc_offset_sec)
     tz_designator = '{0}{1:02d}:{2:02d}'.format(
-            '+' if tz_sec >= 0 else '-', tz_sec // 3600, tz_sec % 3600 // 60)
+            '+' if tz_sec >= 0 else '-', abs(tz_sec) // 3600, abs(tz_sec) % 3600 // 60)
+
+    if getattr(posix_time, 'ndim', 0) > 0:
+        import numpy as np
+
+        # ..convert all at once (which gives the very same times). Note, that
+        #  pandas converts float-seconds one by one, so we do the same integer
+        #  arithmetic (whole seconds + fraction rounded to 9 digits) on the array:
+        posix_time = np.asarray(posix_time, dtype=np.float64)
+        if np.isfinite(posix_time).all():
+            sec = np.trunc(posix_time)
+            posix_ns = sec.astype(np.int64) * 10**9 + (np.round(posix_time - sec, 9) * 1e9).astype(np.int64)
+            return to_datetime(posix_ns, unit='ns', utc=True).tz_convert(tz_designator)
+
+        return to_datetime(posix_time, unit='s', utc=True).tz_convert(tz_designator)
 
     return Timestamp(posix_time, unit='s', tz=tz_designator)
 
 
+# a number in indented JSON (i.e. a value on its own line or after a key),
+#  that the json-module would write with an exponent..
+_float_with_exponent = re.compile(r'^ *(?:"(?:[^"\\]|\\.)*": )?-?(?:[0-9.]+[eE]|0\.0000)', re.M)
+# ..which can only be there, if orjson has written any of these (searching
+#  for them is much faster than running the regex over the whole output):
+_exponent_markers = (' 0.0000', '-0.0000', 'e-') + tuple('e%d' % i for i in range(10))
+
+def dumps_json(obj, default=None):
+    '''Serialize `obj` to a JSON string with an indent of 2.
+
+    This is written in C by `orjson` (if installed), which is much faster than
+    `json.dumps(obj, indent=2)`. The output is the same either way: whatever
+    orjson would write differently (NaN, umlauts, very small or very large
+    floats) is left to the json-module.
+    '''
+    import json
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(obj, indent=2, default=default)
+
+    try:
+        s = orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2).decode()
+    except orjson.JSONEncodeError:
+        # e.g. non-string dict-keys or namedtuples, which json handles fine..
+        s = ''
+    # Note: unlike the json-module, orjson can't escape non-ASCII
+    #  characters, so we fall back for the rare label with an umlaut.
+    #  likewise, orjson writes NaN and infinity as `null`, which can't be
+    #  read back as a number. this can't be told apart from `None`, so any
+    #  'null' falls back to the json-module, which writes them as `NaN`.
+    #  lastly, orjson formats a float with an exponent differently (`1e-7` for
+    #  `1e-07`) and writes e.g. `1e-05` without one, so these fall back, too:
+    if (s and s.isascii() and 'null' not in s and not (
+            (s.startswith('0.0000') or any(marker in s for marker in _exponent_markers))
+            and _float_with_exponent.search(s))):
+        return s
+
+    return json.dumps(obj, indent=2, default=default)
+
+
+try:
+    # Note: the import is resolved once here, since a failed import is not
+    #  cached and would search the whole sys.path again on every call:
+    from orjson import loads as _fast_loads
+except ImportError:
+    from json import loads as _fast_loads
+
+def loads_json(s):
+    '''Deserialize the JSON str or bytes `s`.
+
+    This is parsed by `orjson` (if installed), which is several times faster
+    than `json.loads(s)`, but rejects non-standard JSON like `NaN`. Such
+    input is handed over to the json-module.
+    '''
+    try:
+        return _fast_loads(s)
+    except ValueError:
+        # (orjson.JSONDecodeError is a subclass of ValueError)
+        import json
+
+        return json.loads(s)
+
+
 def parse_presets_file(presets_file):
     '''Load a `presets_file` as XML-tree and interpret the "OP_Mode" of this `Composition`.
     
@@ -93,11 +176,11 @@ def setup_measurement_dir(config_dir=None, data_root_dir="D:/Data", suffix="",
     _pt_formats = ['*.ionipt']
     _al_formats = ['*.alm']
     # make directory with current timestamp:
-    now = datetime.now()
+    stamp = datetime.now().strftime(date_fmt) + suffix
     new_h5_file = os.path.abspath(os.path.join(
         data_root_dir,
-        now.strftime(date_fmt) + suffix,
-        now.strftime(date_fmt) + suffix + '.h5',
+        stamp,
+        stamp + '.h5',
     ))
     new_recipe_dir = os.path.dirname(new_h5_file)
     os.makedirs(new_recipe_dir, exist_ok=False)  # may throw!
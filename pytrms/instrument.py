@@ -1,5 +1,7 @@
 import os.path
 import time
+import json
+import threading
 from abc import abstractmethod, ABC
 
 from .measurement import *
@@ -18,6 +20,7 @@ class Instrument(ABC):
     This is to prevent different instances to be in other states than the instrument.
     '''
     __instance = None
+    __instance_lock = threading.Lock()
 
     def _new_state(self, newstate):
         # Note: we get ourselves a nifty little state-machine :)
@@ -30,14 +33,20 @@ class Instrument(ABC):
             # new instance’s __init__() method will *not* be invoked:
             return cls._Instrument__instance
 
-        # ..that is synchronized with the PTR-instrument state:
-        if backend.is_running:
-            cls = RunningInstrument
-        else:
-            cls = IdleInstrument
+        # Note: the check above is lock-free for the common case. two threads racing
+        #  to create the first instance are serialized here and check once more:
+        with Instrument._Instrument__instance_lock:
+            if Instrument._Instrument__instance is not None:
+                return Instrument._Instrument__instance
 
-        inst = object.__new__(cls)
-        Instrument._Instrument__instance = inst
+            # ..that is synchronized with the PTR-instrument state:
+            if backend.is_running:
+                cls = RunningInstrument
+            else:
+                cls = IdleInstrument
+
+            inst = object.__new__(cls)
+            Instrument._Instrument__instance = inst
 
         return inst
 
@@ -55,8 +64,7 @@ class Instrument(ABC):
         """Get the current value of a setting."""
         # TODO :: this is not an interface implementation
         raw = self.backend.get(varname)
-        if not isinstance(self.backend, MqttClient):
-            import json
+        if getattr(self.backend, 'returns_json', False):
             jobj = json.loads(raw)
 
             return jobj[0]['Act']['Real']
@@ -82,6 +90,15 @@ class Instrument(ABC):
 class IdleInstrument(Instrument):
 
     def start_measurement(self, filename=''):
+        if filename:
+            dirname, basename = os.path.split(filename)
+            # this may very well be a directory to record a filename into:
+            if not basename:
+                basename = '%Y-%m-%d_%H-%M-%S.h5'
+                filename = os.path.join(dirname, basename)
+            # pass everything through strftime *before* touching the filesystem...
+            filename = time.strftime(filename)
+
         dirname = os.path.dirname(filename)
         if dirname and self.is_local:
             # Note: if we send a filepath to the server that does not exist there, the
@@ -90,16 +107,8 @@ class IdleInstrument(Instrument):
             #  but if the server is the local machine, we do our best to verify the path:
             os.makedirs(dirname, exist_ok=True)
 
-        if filename:
-            basename = os.path.basename(filename)
-            # this may very well be a directory to record a filename into:
-            if not basename:
-                basename = '%Y-%m-%d_%H-%M-%S.h5'
-                filename = os.path.join(dirname, basename)
-            # finally, pass everything through strftime...
-            filename = time.strftime(filename)
-            if os.path.exists(filename):
-                raise RuntimeError(f'filename exists and cannot be overwritten')
+        if filename and os.path.exists(filename):
+            raise RuntimeError(f'filename exists and cannot be overwritten')
 
         self.backend.start_measurement(filename)
         self._current_sourcefile = filename
@@ -115,5 +124,5 @@ class RunningInstrument(Instrument):
         self._new_state(IdleInstrument)
 
         # TODO :: this catches only one sourcefile.. it'll do for simple cases:
-        return FinishedMeasurement(_current_sourcefile)
+        return FinishedMeasurement(self._current_sourcefile)
 
@@ -1,8 +1,12 @@
+import os.path
 import time
+import weakref
+import threading
 from operator import attrgetter
 from itertools import chain
 from abc import abstractmethod, ABC
 
+import numpy as np
 import pandas as pd
 
 from .readers import IoniTOFReader
@@ -10,6 +14,22 @@ from .readers import IoniTOFReader
 __all__ = ['Measurement', 'PreparingMeasurement', 'RunningMeasurement', 'FinishedMeasurement']
 
 
+# the readers in use, which are only referenced weakly, so that an unused
+#  reader (e.g. of a file that has been written to since) closes its file:
+_readers = weakref.WeakValueDictionary()
+
+def _cached_reader(path, mtime, reader):
+    # Note: the modification-time is part of the key, so a file
+    #  that has been written to since will be opened anew:
+    key = (path, mtime, reader)
+    rv = _readers.get(key)
+    if rv is None or not rv.hf:
+        # (..and a reader that has been closed in the meantime, too)
+        rv = _readers[key] = reader(path)
+
+    return rv
+
+
 class Measurement(ABC):
     """Class for PTRMS-measurements and batch processing.
 
@@ -48,6 +68,15 @@ class Measurement(ABC):
         """Stop the current measurement on the PTR server."""
         raise RuntimeError("can't stop %s" % self.__class__)
 
+    def wait(self, timeout_s=None):
+        """Block until the measurement has been stopped.
+
+        Returns `False` if 'timeout_s' expired before, `True` otherwise.
+        """
+        # Note: the event is set by `.stop()`, which wakes up any waiting thread
+        #  immediately (rather than having it poll for our state to change):
+        return self._stop_event.wait(timeout_s)
+
     @abstractmethod
     def __len__(self):
         pass
@@ -55,12 +84,20 @@ class Measurement(ABC):
 
 class PreparingMeasurement(Measurement):
 
+    # Note: the spec-time is requested from the server only once and
+    #  remembered until it is set to a new value through this class:
+    _spec_time_ms = None
+
     @property
     def single_spec_duration_ms(self):
-        return self.ptr.get('ACQ_SRV_SpecTime_ms')
+        if self._spec_time_ms is None:
+            self._spec_time_ms = self.ptr.get('ACQ_SRV_SpecTime_ms')
+
+        return self._spec_time_ms
 
     @single_spec_duration_ms.setter
     def single_spec_duration_ms(self, value):
+        self._spec_time_ms = None
         self.ptr.set('ACQ_SRV_SpecTime_ms', int(value), unit='ms')
 
     @property
@@ -89,6 +126,7 @@ class PreparingMeasurement(Measurement):
 
     def __init__(self, instrument):
         self.ptr = instrument
+        self._stop_event = threading.Event()
 
     def start(self, filename=''):
         self.ptr.start_measurement(filename)
@@ -102,10 +140,12 @@ class RunningMeasurement(Measurement):
 
     def __init__(self, instrument):
         self.ptr = instrument
+        self._stop_event = threading.Event()
 
     def stop(self):
         self.ptr.stop_measurement()
         self._new_state(FinishedMeasurement)
+        self._stop_event.set()
 
     def __len__(self):
         return -1
@@ -150,7 +190,8 @@ class FinishedMeasurement(Measurement):
         if not len(filenames):
             raise ValueError("no filename given")
 
-        self.sourcefiles = sorted((_reader(f) for f in filenames), key=attrgetter('time_of_file'))
+        readers = (_cached_reader(os.path.abspath(f), os.path.getmtime(f), _reader) for f in filenames)
+        self.sourcefiles = sorted(readers, key=attrgetter('time_of_file'))
         self._check(self.sourcefiles)
 
     def read_traces(self, kind='conc', index='abs_cycle', force_original=False):
@@ -163,7 +204,37 @@ class FinishedMeasurement(Measurement):
         'abs_time' or 'rel_time'.
 
         """
-        return pd.concat(sf.read_all(kind, index, force_original) for sf in self.sourcefiles)
+        frames = [sf.read_all(kind, index, force_original) for sf in self.sourcefiles]
+        if len(frames) == 1:
+            return frames[0]
+
+        columns = frames[0].columns
+        dtypes = set(frames[0].dtypes)
+        if (len(dtypes) != 1
+                or columns.has_duplicates
+                or not all(columns.equals(frame.columns) for frame in frames[1:])
+                or not all(set(frame.dtypes) == dtypes for frame in frames[1:])):
+            return pd.concat(frames)
+
+        # Note: `pd.concat` copies all frames into a new arena, where each
+        #  column is contiguous in memory. We fill this buffer ourselves
+        #  (column-major, as pandas keeps it) and save the intermediate copy:
+        out = np.empty((len(columns), sum(len(frame) for frame in frames)), dtype=dtypes.pop())
+        offset = 0
+        for frame in frames:
+            out[:, offset:offset+len(frame)] = frame.to_numpy().T
+            offset += len(frame)
+
+        index = frames[0].index.append([frame.index for frame in frames[1:]])
+
+        return pd.DataFrame(out.T, index=index, columns=columns, copy=False)
+
+    def iter_specdata(self):
+        """Iterate over the spectra ("fullcycles") of all sourcefiles in order."""
+        return chain.from_iterable(sf.iter_specdata() for sf in self.sourcefiles)
+
+    def wait(self, timeout_s=None):
+        return True
 
     def __iter__(self):
         return iter(self.sourcefiles)
@@ -65,23 +65,38 @@ Peaks may be modified and the PeakTable exported in the same format:
 
 """
 import os
+import re
 import csv
-import json
 import logging
-from configparser import ConfigParser
-from functools import total_ordering, partial
+from copy import copy
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from itertools import groupby
+from operator import attrgetter
+from functools import partial, lru_cache
 from collections import defaultdict
 import h5py
 
 import pandas as pd
 import numpy as np
 
+from .helpers import dumps_json, loads_json
+
 log = logging.getLogger(__name__)
 
+# the sort-key of the peaks in a PeakTable:
+_center = attrgetter('center')
+
 __all__ = ['Peak', 'PeakTable']
 
 
-@total_ordering
+@lru_cache(maxsize=32)
+def _cached_peaks(path, mtime_ns, size):
+    # Note: the modification-time is part of the key, so a file
+    #  that has been written to since will be parsed anew:
+    return tuple(PeakTable._parse_file(path))
+
+
 class Peak:
     """Defines a Peak in the Spectrum.
 
@@ -105,8 +120,17 @@ class Peak:
     - `multiplier`:  specify a multiplier
 
     """
+    # Note: a peak-table may hold thousands of peaks, so we save
+    #  the memory of a `__dict__` for each one of them:
+    __slots__ = ('center', 'label', 'formula', 'parent', '_borders', 'isotopic_abundance',
+                 'k_rate', 'multiplier', 'resolution', 'shift')
+
     _exact_decimals = 4
 
+    # the attributes that are exported (in this order):
+    _public_attrs = ('center', 'label', 'formula', 'parent', 'isotopic_abundance',
+                     'k_rate', 'multiplier', 'resolution', 'shift')
+
     def __init__(self, center, label='', formula='', parent=None, borders=(),
                  isotopic_abundance=1.0, k_rate=2.0, multiplier=1.0,
                  resolution=1000, shift=0):
@@ -128,6 +152,37 @@ class Peak:
         self.resolution = float(resolution)
         self.shift = float(shift)
 
+    @classmethod
+    def from_arrays(cls, centers, labels, lows, highs, k_rates, multipliers):
+        """Create a list of peaks from columns of equal length.
+
+        This gives the same peaks as calling `Peak(center, label, borders=(low, high),
+        k_rate=k_rate, multiplier=multiplier)` on every row, only faster.
+        """
+        # Note: convert the columns to python floats all at once, so the loop
+        #  can set the slots directly and skip the coercions in `__init__`.
+        #  the rounding is left to `round()`, which may differ from `np.round`
+        #  in the last digit and would give different centers than `__init__`:
+        columns = (np.asarray(column, dtype=np.float64).tolist()
+                   for column in (centers, lows, highs, k_rates, multipliers))
+        ndigits = cls._exact_decimals
+        peaks = []
+        for label, center, low, high, k_rate, multiplier in zip(list(labels), *columns):
+            peak = cls.__new__(cls)
+            peak.center = center = round(center, ndigits)
+            peak.label = str(label) if label else 'm{:.4f}'.format(center)
+            peak.formula = ''
+            peak.parent = ''
+            peak._borders = (round(low, 4), round(high, 4))
+            peak.isotopic_abundance = 1.0
+            peak.k_rate = k_rate
+            peak.multiplier = multiplier
+            peak.resolution = 1000.0
+            peak.shift = 0.0
+            peaks.append(peak)
+
+        return peaks
+
     @property
     def is_unitmass(self):
         return self.center == round(self.center)
@@ -139,18 +194,44 @@ class Peak:
         else:
             return self.center - 0.5, self.center + 0.5
 
+    # Note: the comparisons are spelled out (rather than using `total_ordering`),
+    #  because they are called a lot when sorting and each one can skip rounding
+    #  the other mass, if it is a Peak, whose center has been rounded already:
+
+    @staticmethod
+    def _mass_of(other):
+        if isinstance(other, Peak):
+            return other.center
+        return round(float(other), Peak._exact_decimals)
+
     def __lt__(self, other):
-        return self.center < round(float(other), Peak._exact_decimals)
+        return self.center < Peak._mass_of(other)
+
+    def __le__(self, other):
+        return self.center <= Peak._mass_of(other)
+
+    def __gt__(self, other):
+        return self.center > Peak._mass_of(other)
+
+    def __ge__(self, other):
+        return self.center >= Peak._mass_of(other)
 
     def __eq__(self, other):
-        return self.center == round(float(other), Peak._exact_decimals)
+        return self.center == Peak._mass_of(other)
 
     def __hash__(self):
-        return hash(str(self.center) + self.label)
+        return hash((self.center, self.label))
 
     def __float__(self):
         return self.center
 
+    def __copy__(self):
+        # (all attributes are immutable, so a shallow copy is a full copy)
+        other = Peak.__new__(type(self))
+        for name in Peak.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
     def __repr__(self):
         return '<%s @ %.4f+%.4f [%s]>' % (self.__class__.__name__,
                 self.center, self.shift, self.label)
@@ -164,6 +245,16 @@ class PeakTable:
 
     @staticmethod
     def from_file(filename):
+        # Note: the same peak-table is often loaded over and over again, so the
+        #  parsed peaks are cached as long as the file remains unchanged. but
+        #  every PeakTable gets its own copies, which may be modified freely:
+        st = os.stat(filename)
+        peaks = _cached_peaks(os.path.abspath(filename), st.st_mtime_ns, st.st_size)
+
+        return PeakTable._from_sorted(map(copy, peaks))
+
+    @staticmethod
+    def _parse_file(filename):
         base, ext = os.path.splitext(filename)
         if ext == '.ipt':
             with open(filename, 'rb') as f:
@@ -190,44 +281,59 @@ class PeakTable:
     def _parse_ipt(file):
         column_names = ['Descriptions', 'MassCenters', 'BorderLow',
                         'BorderHigh', 'Multipliers', 'kRates']
+        # Note: with explicit column-types, pandas doesn't need to infer them:
+        column_types = dict.fromkeys(column_names, np.float64)
+        column_types['Descriptions'] = str
         table = pd.read_csv(file, sep='\t', skip_blank_lines=True,
-                            header=None, names=column_names,
-                            index_col=False, float_precision='high')
+                            header=None, names=column_names, dtype=column_types,
+                            index_col=False, float_precision='high', engine='c')
 
-        peaks = []
-        for row in table.itertuples(index=False):
-            borders = row.BorderLow, row.BorderHigh
-            peaks.append(Peak(center=row.MassCenters, label=row.Descriptions,
-                              borders=borders, k_rate=row.kRates,
-                              multiplier=row.Multipliers))
+        return PeakTable._from_unsorted(Peak.from_arrays(
+            centers=table['MassCenters'], labels=table['Descriptions'],
+            lows=table['BorderLow'], highs=table['BorderHigh'],
+            k_rates=table['kRates'], multipliers=table['Multipliers']))
 
-        return PeakTable(peaks)
+    # a section-header or a key-value-pair in an .ipta (.ini-style) file:
+    _ipta_line = re.compile(r'^[ \t]*(?:\[([^\]\n]+)\][ \t\r]*$|([^\s;#=:][^=:\n]*)[=:]([^\n]*))', re.M)
 
     @staticmethod
     def _parse_ipta(file):
-        cp = ConfigParser()
-        cp.read_file(file)
+        # Note: we only need a handful of keys from every section, so scanning
+        #  the file once is much faster than building a full ConfigParser.
+        #  the pattern has no lazy quantifiers, the keys and values are
+        #  rather stripped afterwards (which is quite a lot faster):
+        sections = dict()
+        sec = None
+        for section, key, value in PeakTable._ipta_line.findall(file.read()):
+            if section:
+                sec = sections.setdefault(section, dict())
+            elif sec is not None:
+                # (keys are case-insensitive, same as for the ConfigParser)
+                sec[key.rstrip().lower()] = value.strip()
+
         i = 0
-        peaks = []
+        rows = []
         while True:
             try:
                 i += 1
                 ps = 'Peak_{:04d}'.format(i)  # the 'peakstring', something like Peak_0042
-                sec = cp[ps]
-                if int(sec['NumOfPeaks']) > 1:
+                sec = sections[ps]
+                pl = ps.lower()
+                if int(sec['numofpeaks']) > 1:
                     log.warning("File %s contains multipeaks. This feature is not supported "
                                 "by this parser! Returning only the first peak!" % file.name)
-                borders = float(sec['BorderLow']), float(sec['BorderHigh'])
-                peaks.append(Peak(center=float(sec[ps + '_MassCenters_1']),
-                                  borders=borders,
-                                  label=sec[ps+'_Descriptions_1'],
-                                  k_rate=float(sec[ps+'_kRates_1']),
-                                  multiplier=float(sec[ps+'_Multipliers_1'])))
+                rows.append((sec[pl + '_masscenters_1'], sec[pl + '_descriptions_1'],
+                             sec['borderlow'], sec['borderhigh'],
+                             sec[pl + '_krates_1'], sec[pl + '_multipliers_1']))
             except KeyError:
                 break
-        log.info("Parsed %d Peaks from %s." % (len(peaks), file.name))
+        log.info("Parsed %d Peaks from %s." % (len(rows), file.name))
+
+        # ..and convert the (string-)columns to numbers all at once:
+        centers, labels, lows, highs, k_rates, multipliers = zip(*rows) if rows else [()] * 6
 
-        return PeakTable(peaks)
+        return PeakTable._from_unsorted(Peak.from_arrays(centers, labels, lows, highs,
+                                                         k_rates, multipliers))
 
     @staticmethod
     def _parse_ipt2(file):
@@ -237,41 +343,26 @@ class PeakTable:
     def _parse_txt(file):
         raise NotImplementedError
 
+    @staticmethod
     def _parse_h5(file):
-        tempData = file['/TRACEdata/TraceInfo']
-
-        # Functions to Convert H5 binary to str, and further to float, int if needed
-        vfunc_str = np.vectorize(lambda t: t.decode("utf-8"))
-        vfunc_float = np.vectorize(lambda t: float(t.decode("utf-8")))
-        vfunc_int = np.vectorize(lambda t: int(t.decode("utf-8")))
-
-        table = pd.DataFrame(data={
-            'Descriptions': vfunc_str(tempData[1]),
-            'MassCenters': vfunc_float(tempData[2]),
-            'BorderLow': vfunc_float(tempData[3]),
-            'BorderHigh': vfunc_float(tempData[4]),
-            'Multipliers': vfunc_float(tempData[5]),
-            'kRates': vfunc_float(tempData[6])},
-            index=vfunc_int(tempData[0]))
-
+        tempData = file['/TRACEdata/TraceInfo'][()]
 
-        peaks = []
-        for row in table.itertuples(index=False):
-            borders = row.BorderLow, row.BorderHigh
-            peaks.append(Peak(center=row.MassCenters, label=row.Descriptions,
-                              borders=borders, k_rate=row.kRates,
-                              multiplier=row.Multipliers))
+        # convert the H5 binary strings to str, and further to float, all at once:
+        labels = np.char.decode(tempData[1], 'utf-8')
+        centers, lows, highs, multipliers, k_rates = np.char.decode(tempData[2:7], 'utf-8').astype(np.float64)
 
-        return PeakTable(peaks)
+        return PeakTable._from_unsorted(Peak.from_arrays(centers, labels.tolist(), lows, highs,
+                                                         k_rates, multipliers))
 
     @staticmethod
     def _parse_json(file):
-        version, resolution, peak_list = json.load(file).values()
-        peaks = []
-        for pars in peak_list:
-            peaks.append(Peak(**pars))
+        # Note: a peak-table is small enough to be loaded at once (the pure
+        #  python streaming-parsers are slower than this). but pick the peaks
+        #  by their key, so the order of the other entries doesn't matter:
+        peak_list = loads_json(file.read())['peaks']
+        peaks = [Peak(**pars) for pars in peak_list]
 
-        return PeakTable(peaks)
+        return PeakTable._from_unsorted(peaks)
 
     @staticmethod
     def _parse_ionipt(file):
@@ -288,7 +379,7 @@ class PeakTable:
                 resolution=ioni_p["resolution"],
                 shift=shift)
 
-        peak_list = json.load(file)
+        peak_list = loads_json(file.read())
         peaks = []
         for item in peak_list:
             border_peak = item["border_peak"]
@@ -312,17 +403,14 @@ class PeakTable:
                         parent = ioni_peak["name"]
                     peaks.append(_make_peak(ioni_peak, borders, shift, parent))
 
-        return PeakTable(peaks)
+        return PeakTable._from_unsorted(peaks)
 
     def _write_json(self, fp, resolution=6000, fileversion='1.0'):
-        s = json.dumps({'version': fileversion,
-                        'R': resolution,
-                        'peaks': [{key: val for key, val in vars(peak).items()
-                                            if not key.startswith('_')}
-                                  for peak in self.peaks],
-                        },
-                       indent=2)
-        fp.write(s)
+        fp.write(dumps_json({'version': fileversion,
+                         'R': resolution,
+                         'peaks': [{key: getattr(peak, key) for key in Peak._public_attrs}
+                                   for peak in self.peaks],
+                         }))
 
     def _write_ipt(self, fp, fileversion='1.0'):
         if fileversion not in ['1.0', '1.1']:
@@ -339,46 +427,45 @@ class PeakTable:
                 columns += [p.resolution, p.shift]
             out.writerow([_string_format(p.label)] + list(map(_number_format, columns)))
 
+    # one peak in an .ipta file (the section name is also a prefix of some keys):
+    _ipta_section = (
+        '[{ps}]\n'
+        'Mode = 0\n'
+        'NumOfPeaks = 1\n'
+        'BorderLow = {low}\n'
+        'BorderHigh = {high}\n'
+        '{ps}_NumDescriptions = 1\n'
+        '{ps}_Descriptions_1 = {label}\n'
+        '{ps}_NumMassCenters = 1\n'
+        '{ps}_MassCenters_1 = {center}\n'
+        '{ps}_NumMultipliers = 1\n'
+        '{ps}_Multipliers_1 = {multiplier}\n'
+        '{ps}_NumkRates = 1\n'
+        '{ps}_kRates_1 = {k_rate}\n'
+        'GaussPercent = 0.000000\n'
+        'GaussHeight = 0.000000\n'
+        'GaussWidth = 0.002000\n'
+        '{ps}_NumIsPrimIon = 1\n'
+        '{ps}_IsPrimIon_1 = 0.000000\n'
+        '{ps}_NumSigma = 1\n'
+        '{ps}_Sigma_1 = 0.000000\n'
+        'GaussCenter = 0.000000\n'
+        'FitFunction = 0\n'
+        '\n')
+
     def _write_ipta(self, fp, fileversion='1.0'):
         if fileversion != '1.0':
             raise NotImplementedError("Can't write .ipta version %s!" % fileversion)
 
-        cp = ConfigParser()
-        cp.optionxform = str
-
-        sec_name = 'General'
-        cp.add_section(sec_name)
-        sec = cp[sec_name]
-        sec['PeaksVersion'] = str(fileversion)
-
+        # Note: this writes the same format as `ConfigParser.write()` would,
+        #  but in one pass and without building all sections in memory first:
+        fp.write('[General]\nPeaksVersion = %s\n\n' % fileversion)
         for i, peak in enumerate(self):
-            sec_name = 'Peak_{:04d}'.format(i+1)
-            cp.add_section(sec_name)
-            sec = cp[sec_name]
-            sec['Mode'] = '0'
-            sec['NumOfPeaks'] = '1'
-            borders = peak.borders
-            sec['BorderLow'] = str(borders[0])
-            sec['BorderHigh'] = str(borders[1])
-            sec[sec_name+'_NumDescriptions'] = '1'
-            sec[sec_name+'_Descriptions_1'] = str(peak.label)
-            sec[sec_name+'_NumMassCenters'] = '1'
-            sec[sec_name+'_MassCenters_1'] = str(peak.center)
-            sec[sec_name+'_NumMultipliers'] = '1'
-            sec[sec_name+'_Multipliers_1'] = str(peak.multiplier)
-            sec[sec_name+'_NumkRates'] = '1'
-            sec[sec_name+'_kRates_1'] = str(peak.k_rate)
-            sec['GaussPercent'] = '0.000000'
-            sec['GaussHeight'] = '0.000000'
-            sec['GaussWidth'] = '0.002000'
-            sec[sec_name+'_NumIsPrimIon'] = '1'
-            sec[sec_name+'_IsPrimIon_1'] = '0.000000'
-            sec[sec_name+'_NumSigma'] = '1'
-            sec[sec_name+'_Sigma_1'] = '0.000000'
-            sec['GaussCenter'] = '0.000000'
-            sec['FitFunction'] = '0'
-
-        cp.write(fp)
+            low, high = peak.borders
+            fp.write(PeakTable._ipta_section.format(ps='Peak_{:04d}'.format(i+1),
+                low=low, high=high, label=str(peak.label).replace('\n', '\n\t'),
+                center=peak.center, multiplier=peak.multiplier, k_rate=peak.k_rate))
+
         log.info("Written %d Peaks to %s." % (len(self), fp.name))
 
     @staticmethod
@@ -388,15 +475,29 @@ class PeakTable:
     def __init__(self, peaks: list = ()):
         self.peaks = sorted(peaks)
 
+    # Note: sorting with `Peak.__lt__` is costly for thousands of peaks, but
+    #  the peaks of a parsed file only need to be sorted by their center and
+    #  those taken from another PeakTable are already in order:
+
+    @classmethod
+    def _from_sorted(cls, peaks):
+        self = cls.__new__(cls)
+        self.peaks = list(peaks)
+        return self
+
+    @classmethod
+    def _from_unsorted(cls, peaks):
+        return cls._from_sorted(sorted(peaks, key=_center))
+
     @property
     def nominal(self):
         peaks = [peak for peak in self.peaks if not peak.parent]
-        return PeakTable(peaks)
+        return PeakTable._from_sorted(peaks)
 
     @property
     def fitted(self):
         peaks = [peak for peak in self.peaks if peak.parent]
-        return PeakTable(peaks)
+        return PeakTable._from_sorted(peaks)
 
     @property
     def exact_masses(self):
@@ -411,18 +512,31 @@ class PeakTable:
 
         Raises KeyError if not found.
         """
-        lo, hi = 0, len(self) - 1
-        while lo <= hi:
-            mid = (lo + hi) // 2
-            if self[mid] == exact_mass:
-                return self[mid]
-            elif self[mid] < exact_mass:
-                lo = mid + 1
-            elif self[mid] > exact_mass:
-                hi = mid - 1
+        i = self._bisect(exact_mass, bisect_left)
+        if i < len(self) and self.peaks[i] == exact_mass:
+            return self.peaks[i]
 
         raise KeyError("No such peak at %s!" % str(exact_mass))
 
+    def find_by_masses(self, exact_masses):
+        """Return the peaks at `exact_masses` up to 4 decimal digits precision.
+
+        Raises KeyError if any one is not found.
+        """
+        # Note: the masses are rounded the same way as the peak-centers (which
+        #  isn't necessarily what `np.round()` does), but searched all at once:
+        exact_masses = list(exact_masses)
+        masses = np.array([Peak._mass_of(mass) for mass in exact_masses], dtype=np.float64)
+        centers = np.fromiter((peak.center for peak in self.peaks), dtype=np.float64, count=len(self))
+        indices = np.searchsorted(centers, masses)
+        found = indices < len(centers)
+        found[found] = centers[indices[found]] == masses[found]
+        if not np.all(found):
+            missing = exact_masses[int(np.argmin(found))]
+            raise KeyError("No such peak at %s!" % str(missing))
+
+        return [self.peaks[i] for i in indices.tolist()]
+
     def group(self):
         groups = defaultdict(list)
         for peak in self:
@@ -456,38 +570,73 @@ class PeakTable:
         if not isinstance(peak, Peak):
             raise TypeError("Can only insert a Peak into a PeakTable!")
 
-        if peak in (self.peaks[:index] + self.peaks[index+1:]):
+        # Note: any peak equal to the new one is found by bisecting the sorted
+        #  table, rather than comparing it with a copy of all the other peaks:
+        index = range(len(self.peaks))[index]  # (may raise IndexError)
+        lo, hi = self._bisect(peak, bisect_left), self._bisect(peak, bisect_right)
+        if any(i != index for i in range(lo, hi)):
             raise ValueError("PeakTable must be unique! Can't add %r." % peak)
 
         self.peaks[index] = peak
+        # keep the table sorted, which the lookup by mass relies on:
+        self.peaks.sort(key=_center)
+
+    @staticmethod
+    def _merge(left, right, symmetric=False):
+        """Merge two sorted lists of peaks, where peaks are the same if they
+        have the same center and label.
+
+        Returns the union or, if `symmetric`, the peaks found on one side only.
+        """
+        # Note: since both sides are sorted, peaks with the same center end up
+        #  next to each other and we only need to compare them among themselves:
+        tagged = merge(((peak, 0) for peak in left), ((peak, 1) for peak in right),
+                       key=lambda item: item[0].center)
+        rv = []
+        for center, group in groupby(tagged, key=lambda item: item[0].center):
+            first = dict()
+            sides = defaultdict(set)
+            for peak, side in group:
+                first.setdefault(peak.label, peak)
+                sides[peak.label].add(side)
+            rv.extend(peak for label, peak in first.items()
+                      if not symmetric or len(sides[label]) == 1)
+
+        return rv
 
     def __add__(self, other):
         if isinstance(other, PeakTable):
-            return PeakTable(set(self.peaks) | set(other.peaks))
+            return PeakTable._from_sorted(PeakTable._merge(self.peaks, other.peaks))
         elif isinstance(other, Peak):
-            return PeakTable(set(self.peaks) | set([other,]))
+            return PeakTable._from_sorted(PeakTable._merge(self.peaks, [other,]))
         else:
             raise TypeError(str(other))
 
     def __sub__(self, other):
         if isinstance(other, PeakTable):
-            return PeakTable(set(self.peaks) ^ set(other.peaks))
+            return PeakTable._from_sorted(PeakTable._merge(self.peaks, other.peaks, symmetric=True))
         elif isinstance(other, Peak):
-            return PeakTable(set(self.peaks) ^ set([other,]))
+            return PeakTable._from_sorted(PeakTable._merge(self.peaks, [other,], symmetric=True))
         else:
             raise TypeError(str(other))
 
+    # Note: the peaks are sorted by their center, so comparing the table with a
+    #  mass is a matter of bisecting it rather than comparing every single peak:
+
+    def _bisect(self, other, bisect):
+        return bisect(self.peaks, round(float(other), Peak._exact_decimals), key=_center)
+
     def __gt__(self, other):
-        return PeakTable([peak for peak in self.peaks if peak > other])
+        return PeakTable._from_sorted(self.peaks[self._bisect(other, bisect_right):])
 
     def __ge__(self, other):
-        return PeakTable([peak for peak in self.peaks if peak >= other])
+        return PeakTable._from_sorted(self.peaks[self._bisect(other, bisect_left):])
 
     def __lt__(self, other):
-        return PeakTable([peak for peak in self.peaks if peak < other])
+        return PeakTable._from_sorted(self.peaks[:self._bisect(other, bisect_left)])
 
     def __le__(self, other):
-        return PeakTable([peak for peak in self.peaks if peak <= other])
+        return PeakTable._from_sorted(self.peaks[:self._bisect(other, bisect_right)])
 
     def __repr__(self):
         if not len(self):
@@ -1,4 +1,5 @@
 # import matplotlib.pyplot as plt  # should be inlined, loads forever!
+_plt = None
 
 
 def plot_marker(signal, marker, **kwargs):
@@ -6,9 +7,12 @@ def plot_marker(signal, marker, **kwargs):
 
     Returns a tuple of `figure, axis`.
     '''
-    import matplotlib.pyplot as plt
+    global _plt
+    if _plt is None:
+        # (imported on first use and kept for subsequent calls)
+        import matplotlib.pyplot as _plt
 
-    fig, ax = plt.subplots()
+    fig, ax = _plt.subplots()
     if hasattr(signal, 'plot'):
         subplot = signal.plot(ax=ax)
         line, *_ = subplot.get_lines()
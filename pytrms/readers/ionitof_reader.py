@@ -1,6 +1,6 @@
 import os.path
-from functools import partial, lru_cache
-from itertools import islice
+import weakref
+from functools import cached_property, wraps
 
 import h5py
 import numpy as np
@@ -16,40 +16,64 @@ class GroupNotFoundError(KeyError):
     pass
 
 
+def _instance_cache(method):
+    """Cache the results of a `method` with the instance.
+
+    Unlike `lru_cache`, this doesn't keep the instance alive and the cached
+    results are released along with it. hdf5-objects are keyed by name.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__,
+               *(arg.name if isinstance(arg, h5py.HLObject) else arg for arg in args),
+               *sorted(kwargs.items()))
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        rv = self._cache[key] = method(self, *args, **kwargs)
+
+        return rv
+
+    return wrapper
+
+
 class IoniTOFReader:
 
-    @property
-    @lru_cache
+    # Note: the metadata is computed on first access and stored with the instance,
+    #  so any later access is a plain attribute-lookup:
+
+    @cached_property
     def time_of_meas(self):
         """The pandas.Timestamp of the 0th measurement cycle."""
-        return next(self.iter_index('abs_time')) - next(self.iter_index('rel_time'))
+        return next(self._iter_index('abs_time', stop=1)) - next(self._iter_index('rel_time', stop=1))
 
-    @property
-    @lru_cache
+    @cached_property
     def time_of_file(self):
         """The pandas.Timestamp of the 0th file cycle."""
         # ..which is *not* the 1st file-cycle, but the (unrecorded) one before..
-        file0 = next(self.iter_index('abs_time')) - pd.Timedelta(self.single_spec_duration_ms, 'ms')
+        file0 = next(self._iter_index('abs_time', stop=1)) - pd.Timedelta(self.single_spec_duration_ms, 'ms')
         # ..and should never pre-pone the measurement time:
         return max(file0, self.time_of_meas)
 
-    @property
-    @lru_cache
+    @cached_property
     def time_of_file_creation(self):
         """The pandas.Timestamp of the file creation."""
         return convert_labview_to_posix(float(self.hf.attrs['FileCreatedTime_UTC']), self.utc_offset_sec)
 
-    @property
-    @lru_cache
+    @cached_property
     def utc_offset_sec(self):
         """The pandas.Timestamp of the 0th file cycle."""
         return int(self.hf.attrs['UTC_Offset'])
 
-    @property
+    # Note: the file is opened read-only, so the following attributes are read
+    #  from the hdf5-file only once (except for the serial_nr, which may be set):
+
+    @cached_property
     def inst_type(self):
         return str(self.hf.attrs.get('InstrumentType', [b'',])[0].decode('latin-1'))
 
-    @property
+    @cached_property
     def sub_type(self):
         return str(self.hf.attrs.get('InstSubType', [b'',])[0].decode('latin-1'))
 
@@ -59,7 +83,14 @@ class IoniTOFReader:
 
     @serial_nr.setter
     def serial_nr(self, number):
+        if str(number) == self.serial_nr:
+            return
+
+        # Note: hdf5 refuses to open the file for writing while we hold it
+        #  read-only, so we have to re-open it. the cached values are keyed
+        #  by name (not by hdf5-object) and stay valid:
         path = self.filename
+        self._finalizer.detach()
         self.hf.close()
         try:
             hf = h5py.File(path, 'r+')
@@ -70,35 +101,78 @@ class IoniTOFReader:
             # well it didn't work..
             pass
         finally:
-            self.hf = h5py.File(path, 'r', swmr=False)
+            self.hf = h5py.File(path, 'r', **self._h5_options)
+            self._finalizer = weakref.finalize(self, self.hf.close)
 
-    @property
+    @cached_property
     def number_of_timebins(self):
         return int(self.hf['SPECdata/Intensities'].shape[1])
 
-    @property
+    @cached_property
     def timebin_width_ps(self):
         return float(self.hf.attrs.get('Timebin width (ps)'))
 
-    @property
+    @cached_property
     def poisson_deadtime_ns(self):
         return float(self.hf.attrs.get('PoissonDeadTime (ns)'))
 
-    @property
+    @cached_property
     def pulsing_period_ns(self):
         return float(self.hf.attrs.get('Pulsing Period (ns)'))
 
-    @property
+    @cached_property
     def start_delay_ns(self):
         return float(self.hf.attrs.get('Start Delay (ns)'))
 
-    @property
+    @cached_property
     def single_spec_duration_ms(self):
         return float(self.hf.attrs.get('Single Spec Duration (ms)'))
 
-    def __init__(self, path):
-        self.hf = h5py.File(path, 'r', swmr=False)
+    def __init__(self, path, rdcc_nbytes=None):
+        # Note: the size of the hdf5 chunk-cache may be tuned for files with large
+        #  chunks, but the default of h5py is kept unless asked otherwise, since
+        #  a cache holding many small (per-cycle) chunks can be much slower:
+        self._h5_options = dict(swmr=False, rdcc_nbytes=rdcc_nbytes)
+        self.hf = h5py.File(path, 'r', **self._h5_options)
+        self._cache = dict()
         self.filename = os.path.abspath(self.hf.filename)
+        # Note: close the file-handle as soon as this reader is collected, so
+        #  batch-processing many files doesn't run out of file-descriptors:
+        self._finalizer = weakref.finalize(self, self.hf.close)
+
+    def close(self):
+        """Close the hdf5-file and release all cached data."""
+        self._cache.clear()
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # the (approximate) size of the buffer used by `.iter_specdata()`:
+    specdata_block_bytes = 2**25
+
+    # Note: the lookup-tables are built once with the class, not on every call:
+    _index_lut = {
+            'rel_cycle': (0, lambda self, a: pd.Index(a.astype('int', copy=False))),
+            'abs_cycle': (1, lambda self, a: pd.Index(a.astype('int', copy=False))),
+            'abs_time':  (2, lambda self, a: convert_labview_to_posix(a, self.utc_offset_sec)),
+            'rel_time':  (3, lambda self, a: pd.to_timedelta(a, unit='s')),
+    }
+
+    _processed_trace_lut = {
+        'con': 'Concentrations',
+        'raw': 'Raw',
+        'cor': 'Corrected',
+    }
+
+    _original_trace_lut = {
+        'con': 'TraceConcentration',
+        'raw': 'TraceRaw',
+        'cor': 'TraceCorrected',
+    }
 
     table_locs = {
         'primary_ions': '/PTR-PrimaryIons',
@@ -112,13 +186,16 @@ class IoniTOFReader:
         except KeyError as exc:
             raise KeyError(str(exc) + f", possible values: {list(IoniTOFReader.table_locs.keys())}")
 
+        # Note: the datasets are tiny, so we read them whole instead of row by row:
+        names = [s.decode('latin-1') for s in grp['Descriptions'][()]]
+        masses_factors = grp['Masses_Factors'][()]
+
         rv = []
-        for i, name in enumerate(s.decode('latin-1') for s in grp['Descriptions']):
+        for name, dset in zip(names, masses_factors):
             # Note: the dataset is 10 x 2 x 10 by default, but we remove all empty rows...
             if not len(name):
                 continue
 
-            dset = grp['Masses_Factors'][i]
             # ...and columns:
             filled = np.all(dset, axis=0)
             masses = dset[0, filled]
@@ -132,6 +209,28 @@ class IoniTOFReader:
 
         - 'index' one of abs_cycle|abs_time|rel_cycle|rel_time
         """
+        labels, selection = self._select_addtraces(matches)
+
+        # Note: collecting the columns of all groups and building a single
+        #  DataFrame is much cheaper than concatenating one frame per group:
+        blocks = [self._read_datainfo_arrays(loc)[1][:, keep] for loc, keep in selection]
+
+        index = self.make_index(index)
+        if len(set(block.dtype for block in blocks)) > 1:
+            # ..mixed types must not be cast to a common type:
+            columns = zip(labels, (column for block in blocks for column in block.T))
+            return pd.DataFrame(dict(columns), index=index)
+
+        data = np.empty((len(index), len(labels)), dtype=blocks[0].dtype, order='F')
+        np.concatenate(blocks, axis=1, out=data)
+
+        return pd.DataFrame(data, columns=labels, index=index)
+
+    def _select_addtraces(self, matches=None):
+        """Select the Data-Info groups and their columns for `.read_addtraces()`.
+
+        Returns the labels and a list of (location, column-indices) per group.
+        """
         if matches is not None:
             if callable(matches):
                 filter_fun = matches
@@ -146,11 +245,18 @@ class IoniTOFReader:
         if not len(locs):
             raise ValueError(f"no match for {matches} in {self._locate_datainfo()}")
 
-        rv = pd.concat((self._read_datainfo(loc) for loc in locs), axis='columns')
-        rv.index = list(self.iter_index(index))
+        labels = dict()
+        selection = []
+        for loc in locs:
+            keep = []
+            for i, label in enumerate(self._read_datainfo_labels(loc)):
+                # de-duplicate trace-columns to prevent issues...
+                if label not in labels:
+                    labels[label] = None
+                    keep.append(i)
+            selection.append((loc, keep))
 
-        # de-duplicate trace-columns to prevent issues...
-        return rv.loc[:, ~rv.columns.duplicated()]
+        return list(labels), selection
 
     def read_calctraces(self, index='abs_cycle'):
         """Reads the calculated traces into a DataFrame.
@@ -159,7 +265,7 @@ class IoniTOFReader:
         """
         return self.read_addtraces('CalcTraces', index)
 
-    @lru_cache
+    @_instance_cache
     def read_traces(self, kind='conc', index='abs_cycle', force_original=False):
         """Reads the peak-traces of the given 'kind' into a DataFrame.
 
@@ -195,23 +301,28 @@ class IoniTOFReader:
         ], axis='columns')
 
     def iter_index(self, kind='abs_cycle'):
-        lut = {
-                'rel_cycle': (0, lambda a: iter(a.astype('int', copy=False))),
-                'abs_cycle': (1, lambda a: iter(a.astype('int', copy=False))),
-                'abs_time':  (2, lambda a: map(partial(convert_labview_to_posix, utc_offset_sec=self.utc_offset_sec), a)),
-                'rel_time':  (3, lambda a: map(partial(pd.Timedelta, unit='s'), a)),
-        }
+        return self._iter_index(kind)
+
+    def _iter_index(self, kind, start=None, stop=None):
+        return iter(self._read_index(kind, start, stop))
+
+    def _read_index(self, kind, start=None, stop=None):
+        lut = IoniTOFReader._index_lut
         try:
-            _N, convert2iterator = lut[kind.lower()]
+            _N, convert2index = lut[kind.lower()]
         except KeyError as exc:
             msg = "Unknown index-type! `kind` must be one of {0}.".format(', '.join(lut.keys()))
             raise KeyError(msg) from exc
     
-        return convert2iterator(self.hf['SPECdata/Times'][:, _N])
+        # Note: the times are stored in chunks of one row, so we
+        #  read only as many rows as needed:
+        return convert2index(self, self.hf['SPECdata/Times'][start:stop, _N])
 
-    @lru_cache
+    @_instance_cache
     def make_index(self, kind='abs_cycle'):
-        return pd.Index(self.iter_index(kind))
+        # Note: the whole column is converted at once, rather than
+        #  building the index from one Timestamp after the other:
+        return self._read_index(kind)
     
     def __len__(self):
         return self.hf['SPECdata/Intensities'].shape[0]
@@ -219,28 +330,57 @@ class IoniTOFReader:
     def iter_specdata(self, start=None, stop=None):
         has_mc_segments = False # self.hf.get('MassCal') is not None
 
-        add_data_dicts = {ad_info.split('/')[1]: self.read_addtraces(ad_info)
-            for ad_info in self._locate_datainfo()
-            if ad_info.startswith('AddTraces')}
-
-        for i in islice(range(len(self)), start, stop):
-            tc = itype.timecycle_t(*self.hf['SPECdata/Times'][i])
-            iy = self.hf['SPECdata/Intensities'][i]
-            if has_mc_segments:
-                raise NotImplementedError("new style mass-cal")
-            else:
-                mc_map = self.hf['CALdata/Mapping']
-                mc_pars = self.hf['CALdata/Spectrum'][i]
-                mc_segs = mc_pars.reshape((1, mc_pars.size))
-                mc = itype.masscal_t(0, mc_map[:, 0], mc_map[:, 1], mc_pars, mc_segs)
-            ad = dict()
-            for ad_info, ad_frame in add_data_dicts.items():
-                ad_series = ad_frame.iloc[i]
-                unit = ''
-                view = 1
-                ad[ad_info] = [itype.add_data_item_t(val, name, unit, view)
-                    for name, val in ad_series.items()]
-            yield itype.fullcycle_t(tc, iy, mc, ad)
+        # Note: the add-data is read along with the spectra block by block
+        #  (with the same columns as `.read_addtraces(ad_info)` would give),
+        #  so only the rows we iterate over are read from the file:
+        add_data_dicts = dict()
+        for ad_info in self._locate_datainfo():
+            if ad_info.startswith('AddTraces'):
+                names, selection = self._select_addtraces(ad_info)
+                sources = [(self.hf[loc + '/Data'], keep) for loc, keep in selection]
+                add_data_dicts[ad_info.split('/')[1]] = (names, sources)
+
+        # Note: reading the datasets row by row costs a round-trip through the
+        #  hdf5-library (and the decompression of a chunk) for every cycle, so
+        #  we read a block of rows at once and iterate over the buffers:
+        spec_dset = self.hf['SPECdata/Intensities']
+        block_size = max(1, IoniTOFReader.specdata_block_bytes // (
+            spec_dset.shape[1] * spec_dset.dtype.itemsize))
+        if spec_dset.chunks is not None:
+            # ..a whole number of chunks, so no chunk is decompressed twice:
+            chunk_rows = spec_dset.chunks[0]
+            block_size = max(chunk_rows, block_size // chunk_rows * chunk_rows)
+
+        # the mass-calibration mapping is the same for all cycles:
+        mc_map = self.hf['CALdata/Mapping'][()]
+
+        rows = range(*slice(start, stop).indices(len(self)))
+        block_start = rows.start
+        while block_start < rows.stop:
+            # (the blocks end on a block-boundary, even if `start` doesn't)
+            block = slice(block_start, min((block_start // block_size + 1) * block_size, rows.stop))
+            block_start = block.stop
+            tc_block = self.hf['SPECdata/Times'][block]
+            iy_block = spec_dset[block]
+            mc_block = self.hf['CALdata/Spectrum'][block]
+            ad_blocks = {ad_info: (names, np.concatenate([dset[block][:, keep] for dset, keep in sources], axis=1))
+                         for ad_info, (names, sources) in add_data_dicts.items()}
+            for j, i in enumerate(range(block.start, block.stop)):
+                tc = itype.timecycle_t(*tc_block[j])
+                iy = iy_block[j]
+                if has_mc_segments:
+                    raise NotImplementedError("new style mass-cal")
+                else:
+                    mc_pars = mc_block[j]
+                    mc_segs = mc_pars.reshape((1, mc_pars.size))
+                    mc = itype.masscal_t(0, mc_map[:, 0], mc_map[:, 1], mc_pars, mc_segs)
+                ad = dict()
+                for ad_info, (names, values) in ad_blocks.items():
+                    unit = ''
+                    view = 1
+                    ad[ad_info] = [itype.add_data_item_t(val, name, unit, view)
+                        for name, val in zip(names, values[j].tolist())]
+                yield itype.fullcycle_t(tc, iy, mc, ad)
 
     def list_file_structure(self):
         """Lists all hdf5 group- and dataset-names."""
@@ -252,13 +392,13 @@ class IoniTOFReader:
     
     def list_addtrace_groups(self):
         """Lists the recorded additional trace-groups."""
-        return sorted(self._locate_datainfo())
+        return list(self._locate_datainfo())
     
     def __repr__(self):
         return "<%s (%s) [no. %s] %s>" % (self.__class__.__name__,
                 self.inst_type, self.serial_nr, self.hf.filename)
 
-    @lru_cache
+    @_instance_cache
     def _locate_datainfo(self):
         """Lookup groups with data-info traces."""
         dataloc = set()
@@ -274,10 +414,14 @@ class IoniTOFReader:
             return None
     
         # use the above 'visit'-function that appends matched sections...
-        self.hf.visit(func)
+        # Note: walking the links (by name) is several times faster than the
+        #  `.visit()` of all objects, which opens each and every one of them:
+        self.hf.visit_links(func)
     
-        # ...and return only groups with both /Data and /Info datasets:
-        return dataloc.intersection(infoloc)
+        # ...and return only groups with both /Data and /Info datasets.
+        # Note: the result is cached, so we return an immutable tuple, which is
+        #  sorted to not depend on the (random) iteration order of the set:
+        return tuple(sorted(dataloc.intersection(infoloc)))
     
     def traces(self):
         """Returns a  'pandas.DataFrame' with all traces concatenated."""
@@ -315,32 +459,53 @@ class IoniTOFReader:
         index = self.make_index()
         if isinstance(key, str):
             return pd.Series(self._get_datacolumn(key), name=key, index=index)
-        else:
-            return pd.DataFrame({k: self._get_datacolumn(k) for k in key}, index=index)
 
-    @lru_cache
+        keys = list(dict.fromkeys(key))
+        locs = [self._locate_datacolumn(k) for k in keys]
+        arrays = {dset_name: self._read_datainfo_arrays(dset_name.rpartition('/')[0])[1]
+                  for dset_name, _ in locs}
+        dtypes = set(a.dtype for a in arrays.values())
+        if len(dtypes) != 1:
+            # ..mixed types must not be cast to a common type:
+            return pd.DataFrame({k: self._get_datacolumn(k) for k in keys}, index=index)
+
+        # Note: the columns are copied from the cached arrays of their groups
+        #  into a single buffer, which the DataFrame takes over as is:
+        data = np.empty((len(index), len(keys)), dtype=dtypes.pop(), order='F')
+        for j, (dset_name, column) in enumerate(locs):
+            data[:, j] = arrays[dset_name][:, column]
+
+        return pd.DataFrame(data, columns=keys, index=index)
+
+    @_instance_cache
     def _build_datainfo(self):
         """Parse all "Data-Info" groups and build a lookup-table.
         """
         lut = dict()
         for group_name in self._locate_datainfo():
-            info = self.hf[group_name + '/Info']
-            for column, label in enumerate(info[:] if info.ndim == 1 else info[0,:]):
-                if hasattr(label, 'decode'):
-                    label = label.decode('latin1')
-                lut[label] = group_name + '/Data', column
+            # Note: the labels are decoded (and cached) once per group:
+            dset_name = group_name + '/Data'
+            for column, label in enumerate(self._read_datainfo_labels(group_name)):
+                lut[label] = dset_name, column
 
         return lut
 
-    def _get_datacolumn(self, key):
+    def _locate_datacolumn(self, key):
         lut = self._build_datainfo()
         if key not in lut and not key.endswith('_Act') and not key.endswith('_Set'):
             # fallback to act-value (which is typically wanted):
             key = key + '_Act'
 
-        dset_name, column = lut[key]  # may raise KeyError
+        return lut[key]  # may raise KeyError
+
+    def _get_datacolumn(self, key):
+        dset_name, column = self._locate_datacolumn(key)
+
+        # Note: the datasets are chunked by rows, so reading a single column
+        #  costs as much as reading them whole, which we do only once per group:
+        _, data = self._read_datainfo_arrays(dset_name.rpartition('/')[0])
 
-        return self.hf[dset_name][:,column]
+        return data[:,column].copy()
     
     def loc(self, label):
         if isinstance(label, int):
@@ -352,20 +517,21 @@ class IoniTOFReader:
         # build a row of all trace-data...
         lut = self._build_datainfo()
         name = self.make_index()[offset]
-        data = {key: self.hf[h5_loc][offset,col] for key, [h5_loc, col] in lut.items()}
+        # Note: read the row of every dataset once instead of every single value:
+        rows = {h5_loc: self.hf[h5_loc][offset] for h5_loc in set(loc for loc, _ in lut.values())}
+        data = {key: rows[h5_loc][col] for key, [h5_loc, col] in lut.items()}
 
         return pd.Series(data, name=name)
 
-    @lru_cache
-    def _read_datainfo(self, group, prefix=''):
-        """Parse a "Data-Info" group into a pd.DataFrame.
+    @_instance_cache
+    def _read_datainfo_labels(self, group, prefix=''):
+        """Read the labels of a "Data-Info" group.
 
         - 'group' a hdf5 group or a string-location to a group
         - 'prefix' names an optional sub-group
         """
         if isinstance(group, str):
             group = self.hf[group]
-        data = group[prefix + 'Data']
         info = group[prefix + 'Info']
         if info.ndim > 1:
             labels = info[0,:]
@@ -373,7 +539,25 @@ class IoniTOFReader:
             labels = info[:]
 
         if hasattr(labels[0], 'decode'):
-            labels = [b.decode('latin1') for b in labels]
+            # Note: decoding the python-bytes of `.tolist()` is faster than both,
+            #  iterating the numpy-scalars and `np.char.decode()`:
+            labels = [b.decode('latin1') for b in labels.tolist()]
+
+        return labels
+
+    @_instance_cache
+    def _read_datainfo_arrays(self, group, prefix=''):
+        """Read a "Data-Info" group into a list of labels and a numpy-array.
+
+        - 'group' a hdf5 group or a string-location to a group
+        - 'prefix' names an optional sub-group
+        """
+        labels = self._read_datainfo_labels(group, prefix)
+        if isinstance(group, str):
+            group = self.hf[group]
+        # Note: handing a h5py.Dataset to pandas reads it piecewise, so we
+        #  rather read the whole dataset into a numpy-array at once:
+        data = group[prefix + 'Data'][()]
     
         # TODO :: wir haben hier diese doesigen Set/Act werte drin, was wollen wir??
         # if keys[0].endswith('[Set]'):
@@ -416,57 +600,66 @@ class IoniTOFReader:
         #    return _trace(set_values, act_values)
     
     
-        return pd.DataFrame(data, columns=labels)
+        return labels, data
     
     def _read_processed_traces(self, kind, index):
         # error conditions:
         # 1) 'kind' is not recognized -> ValueError
         # 2) no 'PROCESSED/TraceData' group -> GroupNotFoundError
         # 3) expected group not found -> KeyError (file is not supported yet)
-        lut = {
-            'con': 'Concentrations',
-            'raw': 'Raw',
-            'cor': 'Corrected',
-        }
         tracedata = self.hf.get('PROCESSED/TraceData')
         if tracedata is None:
             raise GroupNotFoundError()
 
         try:
-            prefix = lut[kind[:3].lower()]
+            prefix = IoniTOFReader._processed_trace_lut[kind[:3].lower()]
         except KeyError as exc:
             msg = ("Unknown trace-type! `kind` must be one of 'raw', 'corrected' or 'concentration'.")
             raise ValueError(msg) from exc
 
         try:
-            data = self._read_datainfo(tracedata, prefix=prefix)
-            pt = self._read_datainfo(tracedata, prefix='PeakTable')
+            columns, data = self._read_datainfo_arrays(tracedata, prefix=prefix)
+            pt_columns, pt = self._read_datainfo_arrays(tracedata, prefix='PeakTable')
         except KeyError as exc:
             raise KeyError(f'unknown group {exc}. filetype is not supported yet.') from exc
 
-        labels = [b.decode('latin1') for b in pt['label']]
-        mapper = dict(zip(data.columns, labels))
-        data.rename(columns=mapper, inplace=True)
-        data.index = list(self.iter_index(index))
-        
-        return data
+        # Note: rather than renaming the columns of a DataFrame afterwards, we
+        #  build it with the labels from the peak-table and the index at once:
+        labels = [b.decode('latin1') for b in pt[:, list(pt_columns).index('label')]]
+        mapper = dict(zip(columns, labels))
+
+        return pd.DataFrame(np.asfortranarray(data), columns=[mapper.get(c, c) for c in columns],
+                            index=self.make_index(index))
 
     def _read_original_traces(self, kind, index):
-        lut = {
-            'con': 'TraceConcentration',
-            'raw': 'TraceRaw',
-            'cor': 'TraceCorrected',
-        }
         tracedata = self.hf['TRACEdata']
         try:
-            loc = lut[kind[:3].lower()]
-            data = tracedata[loc]
+            loc = IoniTOFReader._original_trace_lut[kind[:3].lower()]
+            data = self._read_column_major(tracedata[loc])
         except KeyError as exc:
             msg = ("Unknown trace-type! `kind` must be one of 'raw', 'corrected' or 'concentration'.")
             raise ValueError(msg) from exc
     
+        return pd.DataFrame(data, columns=self._original_trace_labels, index=self.make_index(index))
+
+    @cached_property
+    def _original_trace_labels(self):
+        """The labels of the original traces (the same for every 'kind')."""
         info = self.hf['TRACEdata/TraceInfo']
-        labels = [b.decode('latin1') for b in info[1,:]]
-    
-        return pd.DataFrame(data, columns=labels, index=list(self.iter_index(index)))
+
+        return [b.decode('latin1') for b in info[1,:]]
+
+    @staticmethod
+    def _read_column_major(dset):
+        """Read a 2d dataset into a column-major (Fortran-ordered) numpy-array."""
+        # Note: the DataFrame is used column-wise, so we store its columns contiguously.
+        #  h5py can only read into C-ordered arrays, but by copying one block of rows
+        #  at a time, we don't need a temporary array of the full size:
+        rv = np.empty(dset.shape, dtype=dset.dtype, order='F')
+        row_bytes = dset.shape[1] * dset.dtype.itemsize
+        block_size = max(1, IoniTOFReader.specdata_block_bytes // max(1, row_bytes))
+        for start in range(0, dset.shape[0], block_size):
+            rv[start:start+block_size] = dset[start:start+block_size]
+
+        return rv
 
@@ -0,0 +1,18 @@
+"""Test of module pytrms.helpers
+
+"""
+import json
+
+import pytest
+
+from pytrms.helpers import dumps_json
+
+
+@pytest.mark.parametrize('obj', [
+    {'k_rate': 2.1, 'multiplier': 488.0, 'label': 'm10.0000'},
+    {'tiny': [1e-05, -5e-05, 1e-07], 'huge': 1e16, 'label': 'e-1 e5'},
+    [float('nan'), None, 'Acetonä'],
+    1e-05,
+])
+def test_dumps_json_writes_the_same_as_the_json_module(obj):
+    assert dumps_json(obj) == json.dumps(obj, indent=2)
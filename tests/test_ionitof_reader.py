@@ -0,0 +1,64 @@
+"""Test of module pytrms.readers.ionitof_reader
+
+"""
+import os
+import weakref
+
+import pytest
+
+from pytrms.measurement import FinishedMeasurement
+from pytrms.readers.ionitof_reader import IoniTOFReader
+
+data_dir = os.path.join(os.path.dirname(__file__), '..', 'examples', 'data')
+h5_file = os.path.join(data_dir, 'peter_emmes_2022-03-31_08-51-13.h5')
+
+
+class TestIoniTOFReader:
+
+    def test_close_releases_file_and_caches(self):
+        with IoniTOFReader(h5_file) as reader:
+            traces = reader.read_all()
+            assert len(reader._cache)
+            assert reader.make_index() is reader.make_index()
+
+        assert not reader.hf
+        assert not len(reader._cache)
+        assert len(traces) == 129
+
+    def test_closed_reader_is_not_handed_out_again(self):
+        meas = FinishedMeasurement(h5_file)
+        with meas.sourcefiles[0]:
+            pass
+
+        traces = FinishedMeasurement(h5_file).read_traces()
+
+        assert len(traces) == 129
+
+    def test_addtraces_are_a_new_frame_on_every_call(self):
+        with IoniTOFReader(h5_file) as reader:
+            a = reader.read_addtraces(lambda s: 'PTR' in s)
+            n_cached = len(reader._cache)
+            a.iloc[0, 0] = -999.
+
+            b = reader.read_addtraces(lambda s: 'PTR' in s)
+
+            assert b.iloc[0, 0] != -999.
+            assert len(reader._cache) == n_cached
+
+    def test_reader_is_not_kept_alive_by_its_caches(self):
+        reader = IoniTOFReader(h5_file)
+        reader.read_traces('conc')
+        reader.iloc(0)
+        ref = weakref.ref(reader)
+        del reader
+
+        assert ref() is None
+
+    def test_measurements_share_the_reader_while_in_use(self):
+        meas = FinishedMeasurement(h5_file)
+        assert FinishedMeasurement(h5_file).sourcefiles[0] is meas.sourcefiles[0]
+
+        hf = meas.sourcefiles[0].hf
+        del meas
+
+        assert not hf
@@ -6,7 +6,28 @@ import pytest
 import struct
 
 import pytrms.clients.modbus
-from pytrms.clients.modbus import _pack, _unpack
+from pytrms.clients.modbus import _pack, _unpack, IoniconModbus
+
+
+class FakeModbusClient:
+
+    def __init__(self, registers):
+        self.registers = registers
+
+    def read_input_registers(self, addr, n_regs=1):
+        return [self.registers.get(a, 0) for a in range(addr, addr + n_regs)]
+
+    read_holding_registers = read_input_registers
+
+    def write_multiple_registers(self, addr, values):
+        self.registers.update(enumerate(values, start=addr))
+
+
+def make_client(mc):
+    # skip the __init__ that connects to the server:
+    client = object.__new__(IoniconModbus)
+    client.mc = mc
+    return client
 
 
 class TestIoniconModbus:
@@ -33,4 +54,96 @@ class TestIoniconModbus:
     def test_pack(self, c_type):
         assert _unpack(_pack(42, c_type), c_type) == 42
 
+    def test_read_instrument_data(self):
+        n_parameters = 25
+        registers = {2000: n_parameters}
+        for i in range(n_parameters):
+            par_id = i + 1
+            addr = 2001 + 6 * i
+            registers[addr] = par_id
+            registers.update(enumerate(_pack(par_id * 1.5, 'float'), start=addr + 1))
+            registers.update(enumerate(_pack(par_id * -0.25, 'float'), start=addr + 3))
+            registers[addr + 5] = par_id % 2
+
+        client = make_client(FakeModbusClient(registers))
+
+        rv = client.read_instrument_data()
+
+        assert len(rv) == n_parameters
+        assert list(rv.values())[0] == (1.5, -0.25, 1, 1)
+        assert list(rv.values())[-1] == (37.5, -6.25, 25, 1)
+        assert [par.par_id for par in rv.values()] == list(range(1, n_parameters + 1))
+        assert client.read_parameter('FC_PC') == -0.25
+
+        # an unchanged superblock is re-used, a changed one is decoded anew:
+        registers.update(enumerate(_pack(99.0, 'float'), start=2001 + 6 * 24 + 1))
+        rv2 = client.read_instrument_data()
+
+        assert list(rv2.values())[0] is list(rv.values())[0]
+        assert list(rv2.values())[-1] == (99.0, -6.25, 25, 1)
+
+    def test_read_ame_numbers(self):
+        registers = {}
+        for name, value in [
+                ('user_number', 7), ('step_number', 3), ('run_number', 12),
+                ('use_mean', 1), ('action_number', 42)]:
+            addr, c_fmt, _ = IoniconModbus.address[name]
+            registers.update(enumerate(_pack(value, c_fmt), start=addr))
+
+        client = make_client(FakeModbusClient(registers))
+
+        assert client.read_ame_numbers() == (3, 12, 1, 42, 7)
+
+    def test_read_timecycle(self):
+        addr, _, _ = IoniconModbus.address['tc_conc']
+        registers = {}
+        for offset, value, c_fmt in [
+                (2, 17., 'float'), (4, 42., 'float'), (6, 3749199524.5, 'double'), (10, 12.25, 'double')]:
+            registers.update(enumerate(_pack(value, c_fmt), start=addr + offset))
+
+        client = make_client(FakeModbusClient(registers))
+
+        assert client.read_timecycle('conc') == (17, 42, 3749199524.5, 12.25)
+
+    def test_write_instrument_data_waits_for_ready_register(self):
+        par_id = next(i for i, descr in enumerate(pytrms.clients.modbus._id_to_descr()) if descr)
+        addr = 40000 + 3 * par_id
+        polled = []
+
+        class BusyClient(FakeModbusClient):
+            def read_holding_registers(self, addr, n_regs=1):
+                polled.append(addr)
+                # the register is busy for the first two polls:
+                return [0] if len(polled) > 2 else [1]
+
+        client = make_client(BusyClient({}))
+        client.write_instrument_data(par_id, 42.)
+
+        assert polled == [addr] * 3
+        assert _unpack([client.mc.registers[addr + 1], client.mc.registers[addr + 2]], 'float') == 42.
+
+    def test_n_masses_is_cached(self):
+        addr, c_fmt, _ = IoniconModbus.address['n_masses']
+        registers = dict(enumerate(_pack(42, c_fmt), start=addr))
+
+        client = make_client(FakeModbusClient(registers))
+
+        assert client.n_masses == 42
+
+        registers.update(enumerate(_pack(43, c_fmt), start=addr))
+        assert client.n_masses == 42
+
+        client.n_masses_ttl_s = 0
+        assert client.n_masses == 43
+
+    def test_read_component_names(self):
+        names = ['Isoprene', 'Acetone', 'a' * 32]
+        addr, c_fmt, _ = IoniconModbus.address['n_components']
+        registers = dict(enumerate(_pack(len(names), c_fmt), start=addr))
+        for i, name in enumerate(names):
+            chars = name.encode('latin-1').ljust(32, b'\x00')
+            registers.update(enumerate(struct.unpack('>16H', chars), start=14002 + i * 16))
+
+        client = make_client(FakeModbusClient(registers))
 
+        assert client.read_component_names() == names
@@ -0,0 +1,22 @@
+"""Test of module pytrms.peaktable
+
+"""
+import math
+
+import pytest
+
+from pytrms.peaktable import Peak, PeakTable
+
+
+class TestPeakTable:
+
+    @pytest.mark.parametrize('ext', ['.json', '.ipt3'])
+    def test_round_trip_keeps_nan(self, tmp_path, ext):
+        filename = str(tmp_path / ('peaks' + ext))
+        PeakTable([Peak(21.0219, label='H3O+', k_rate=float('nan')), Peak(42)]).save(filename)
+
+        pt = PeakTable.from_file(filename)
+
+        assert pt.mass_labels == ['H3O+', 'm42.0000']
+        assert math.isnan(pt[0].k_rate)
+        assert pt[1].k_rate == 2.0